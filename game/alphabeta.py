@@ -0,0 +1,343 @@
+import itertools
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from game.board import SYMMETRY_INVERSES, apply_symmetry
+from game.live_windows import THREAT_SPAN, THREAT_WEIGHTS
+from game.rules import GameRules
+from game.transposition import EXACT, LOWER, UPPER, TranspositionTable, get_state_key, pack_turn, unpack_turn
+
+WIN_SCORE = 10 ** 9
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaBot:
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        time_budget: float = 1.0,
+        max_depth: int = 6,
+        cell_limit: int = 8,
+        turn_limit: int = 10,
+        table_size_mb: float = 16.0,
+        use_symmetry: bool = True,
+        use_book: bool = True,
+    ):
+        self.rng = random.Random(seed)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.cell_limit = cell_limit
+        self.turn_limit = turn_limit
+        self.table = TranspositionTable(table_size_mb) if table_size_mb > 0 else None
+        self.use_symmetry = use_symmetry
+        self.use_book = use_book
+        self.books: Dict[Tuple[int, int, int, int, int], object] = {}
+        self.deadline = 0.0
+        self.nodes = 0
+        self.should_stop: Optional[Callable[[], bool]] = None
+        self.last_stats: Dict[str, float] = {}
+
+    def choose_turn(self, rules: GameRules, should_stop: Optional[Callable[[], bool]] = None) -> List[Tuple[int, int]]:
+        started = time.perf_counter()
+        self.deadline = started + self.time_budget
+        self.nodes = 0
+        self.should_stop = should_stop
+        book_turn = self.get_book_turn(rules)
+        if book_turn is not None:
+            self.last_stats = {"nodes": 0, "depth": 0, "elapsed": time.perf_counter() - started, "nodes_per_second": 0.0, "book": True}
+            return book_turn
+        root_index = rules.current_player_index
+        if self.table is not None:
+            self.table.new_search()
+            if self.use_symmetry:
+                rules.board.enable_symmetry_hashes()
+        turns = self.generate_turns(rules)
+        best_turn = turns[0] if turns else []
+        depth_reached = 0
+        if len(turns) > 1:
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    score, turn = self.search_root(rules, turns, depth, root_index)
+                except SearchTimeout:
+                    break
+                best_turn = turn
+                depth_reached = depth
+                turns.remove(turn)
+                turns.insert(0, turn)
+                if abs(score) >= WIN_SCORE // 2:
+                    break
+        elapsed = time.perf_counter() - started
+        self.last_stats = {
+            "nodes": self.nodes,
+            "depth": depth_reached,
+            "elapsed": elapsed,
+            "nodes_per_second": self.nodes / elapsed if elapsed > 0 else 0.0,
+        }
+        if self.table is not None:
+            self.last_stats.update(self.table.get_stats())
+        return list(best_turn)
+
+    def get_book_turn(self, rules: GameRules) -> Optional[List[Tuple[int, int]]]:
+        if not self.use_book:
+            return None
+        from game.opening_book import open_book
+        board = rules.board
+        key = (board.width, board.height, board.player_count, board.zobrist_scheme, rules.compiled_patterns.fingerprint)
+        if key not in self.books:
+            self.books[key] = open_book(rules)
+        book = self.books[key]
+        return book.get_turn(rules) if book is not None else None
+
+    def check_time(self):
+        self.nodes += 1
+        if self.nodes & 31 == 0:
+            if time.perf_counter() > self.deadline or (self.should_stop and self.should_stop()):
+                raise SearchTimeout()
+
+    def search_root(self, rules: GameRules, turns: List[List[Tuple[int, int]]], depth: int, root_index: int) -> Tuple[int, List[Tuple[int, int]]]:
+        alpha = -WIN_SCORE - 1
+        best_turn = turns[0]
+        for turn in turns:
+            rules.apply_turn(turn)
+            try:
+                score = self.alphabeta(rules, depth - 1, alpha, WIN_SCORE + 1, root_index, 1)
+            finally:
+                rules.undo_turn()
+            if score > alpha:
+                alpha = score
+                best_turn = turn
+        return alpha, best_turn
+
+    def alphabeta(self, rules: GameRules, depth: int, alpha: int, beta: int, root_index: int, ply: int) -> int:
+        self.check_time()
+        if rules.game_over:
+            return self.terminal_score(rules, root_index, ply)
+        if depth <= 0:
+            return self.evaluate(rules, root_index)
+
+        key = symmetry = None
+        table_turn = None
+        if self.table is not None:
+            key, symmetry = self.get_position_key(rules, root_index)
+            entry = self.table.probe(key)
+            if entry is not None:
+                entry_depth, flag, value, packed = entry
+                value = self.from_table_score(value, ply)
+                if entry_depth >= depth:
+                    if flag == EXACT:
+                        return value
+                    if flag == LOWER:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value
+                table_turn = self.unpack_table_turn(rules, packed, symmetry)
+
+        turns = self.generate_turns(rules)
+        if not turns:
+            return self.evaluate(rules, root_index)
+        if table_turn is not None:
+            if table_turn in turns:
+                turns.remove(table_turn)
+            turns.insert(0, table_turn)
+
+        alpha_start, beta_start = alpha, beta
+        maximizing = rules.current_player_index == root_index
+        value = -WIN_SCORE - 1 if maximizing else WIN_SCORE + 1
+        best_turn = turns[0]
+        for turn in turns:
+            rules.apply_turn(turn)
+            try:
+                score = self.alphabeta(rules, depth - 1, alpha, beta, root_index, ply + 1)
+            finally:
+                rules.undo_turn()
+            if maximizing:
+                if score > value:
+                    value = score
+                    best_turn = turn
+                alpha = max(alpha, value)
+            else:
+                if score < value:
+                    value = score
+                    best_turn = turn
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if self.table is not None:
+            if value <= alpha_start:
+                flag = UPPER
+            elif value >= beta_start:
+                flag = LOWER
+            else:
+                flag = EXACT
+            board = rules.board
+            symmetric_turn = [apply_symmetry(board.symmetries[symmetry], x, y) for x, y in best_turn] if board.symmetries else best_turn
+            self.table.store(key, depth, flag, self.to_table_score(value, ply), pack_turn(symmetric_turn, board.width, board.height))
+        return value
+
+    def get_position_key(self, rules: GameRules, root_index: int) -> Tuple[int, int]:
+        board_hash, symmetry = rules.board.get_canonical_hash()
+        return board_hash ^ get_state_key(rules.current_player_index, rules.eliminated, root_index), symmetry
+
+    def unpack_table_turn(self, rules: GameRules, packed: int, symmetry: int) -> Optional[List[Tuple[int, int]]]:
+        if not packed:
+            return None
+        board = rules.board
+        cells = unpack_turn(packed, board.width)
+        if board.symmetries:
+            inverse = board.symmetries[SYMMETRY_INVERSES[symmetry]]
+            cells = [apply_symmetry(inverse, x, y) for x, y in cells]
+        if not all(board.is_empty(x, y) for x, y in cells):
+            return None
+        return cells
+
+    def to_table_score(self, value: int, ply: int) -> int:
+        if value >= WIN_SCORE // 2:
+            return value + ply
+        if value <= -WIN_SCORE // 2:
+            return value - ply
+        return value
+
+    def from_table_score(self, value: int, ply: int) -> int:
+        if value >= WIN_SCORE // 2:
+            return value - ply
+        if value <= -WIN_SCORE // 2:
+            return value + ply
+        return value
+
+    def terminal_score(self, rules: GameRules, root_index: int, ply: int) -> int:
+        if rules.winner is None:
+            return 0
+        if rules.winner is rules.players[root_index]:
+            return WIN_SCORE - ply
+        return -WIN_SCORE + ply
+
+    def evaluate(self, rules: GameRules, root_index: int) -> int:
+        tracker = rules.live_windows
+        own = tracker.get_threat_score(rules.players[root_index].player_id)
+        opponents = [
+            tracker.get_threat_score(player.player_id)
+            for i, player in enumerate(rules.players)
+            if i != root_index and rules.is_player_active(i)
+        ]
+        return own - max(opponents, default=0)
+
+    def get_candidate_cells(self, rules: GameRules) -> List[Tuple[int, int]]:
+        board = rules.board
+        cells = board.get_frontier()
+        if not cells:
+            center_x, center_y = board.width // 2, board.height // 2
+            radius = max(1, board.frontier_radius)
+            return [
+                (x, y)
+                for y in range(center_y - radius, center_y + radius + 1)
+                for x in range(center_x - radius, center_x + radius + 1)
+                if board.is_valid_position(x, y) and board.is_empty(x, y)
+            ]
+        return cells
+
+    def score_cell(self, rules: GameRules, x: int, y: int, player_id: int) -> int:
+        tracker = rules.live_windows
+        stones = tracker.stones
+        windows = tracker.windows
+        score = 0
+        for key in tracker.iter_windows_at(x, y):
+            owners = stones.get(key)
+            size = len(windows[key[0]][0])
+            if owners is None:
+                score += THREAT_WEIGHTS[min(THREAT_SPAN, size - 1)]
+            elif len(owners) == 1:
+                for owner, count in owners.items():
+                    if owner == player_id:
+                        score += THREAT_WEIGHTS[min(THREAT_SPAN, size - count - 1)]
+                    else:
+                        score += THREAT_WEIGHTS[min(THREAT_SPAN, size - count)]
+        return score
+
+    def find_winning_turn(self, rules: GameRules, player_id: int) -> Optional[List[Tuple[int, int]]]:
+        tracker = rules.live_windows
+        board = rules.board
+        best = None
+        for key in tracker.get_near_complete(player_id):
+            empty = [cell for cell in tracker.get_window_cells(key) if board.is_empty(*cell)]
+            if len(empty) <= rules.MAX_MOVES_PER_TURN and (best is None or len(empty) < len(best)):
+                best = sorted(empty, key=lambda cell: (cell[1], cell[0]))
+        return best
+
+    def find_threats(self, rules: GameRules) -> List[List[Tuple[int, int]]]:
+        tracker = rules.live_windows
+        board = rules.board
+        threats = []
+        for i, player in enumerate(rules.players):
+            if i == rules.current_player_index or not rules.is_player_active(i):
+                continue
+            for key in tracker.get_near_complete(player.player_id):
+                empty = sorted(
+                    (cell for cell in tracker.get_window_cells(key) if board.is_empty(*cell)),
+                    key=lambda cell: (cell[1], cell[0]),
+                )
+                if len(empty) <= rules.MAX_MOVES_PER_TURN:
+                    threats.append(empty)
+        return threats
+
+    def find_blocking_turns(self, threats: List[List[Tuple[int, int]]], max_moves: int) -> List[List[Tuple[int, int]]]:
+        blocks = set()
+
+        def extend(chosen: Tuple[Tuple[int, int], ...]):
+            chosen_set = set(chosen)
+            for empty in threats:
+                if not chosen_set.intersection(empty):
+                    break
+            else:
+                blocks.add(tuple(sorted(chosen)))
+                return
+            if len(chosen) >= max_moves:
+                return
+            for cell in empty:
+                extend(chosen + (cell,))
+
+        extend(())
+        return [list(block) for block in sorted(blocks, key=lambda block: (len(block), block))]
+
+    def generate_turns(self, rules: GameRules) -> List[List[Tuple[int, int]]]:
+        player_id = rules.get_current_player().player_id
+        winning = self.find_winning_turn(rules, player_id)
+        if winning is not None:
+            return [winning]
+
+        cells = self.get_candidate_cells(rules)
+        scored = sorted(
+            ((self.score_cell(rules, x, y, player_id), self.rng.random(), (x, y)) for x, y in cells),
+            reverse=True,
+        )
+        turns = []
+        seen = set()
+        threats = self.find_threats(rules)
+        if threats:
+            for block in self.find_blocking_turns(threats, rules.MAX_MOVES_PER_TURN):
+                for _, _, cell in scored:
+                    if len(block) >= rules.MAX_MOVES_PER_TURN:
+                        break
+                    if cell not in block:
+                        block.append(cell)
+                if frozenset(block) not in seen:
+                    seen.add(frozenset(block))
+                    turns.append(block)
+        scored = scored[:self.cell_limit]
+        if not scored:
+            return turns
+        size = min(rules.MAX_MOVES_PER_TURN, len(scored))
+        combos = sorted(
+            itertools.combinations(scored, size),
+            key=lambda combo: -sum(score for score, _, _ in combo),
+        )[:self.turn_limit]
+        for combo in combos:
+            turn = [cell for _, _, cell in combo]
+            if frozenset(turn) not in seen:
+                turns.append(turn)
+        return turns
@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional, Tuple
+from game.board import Board, CompiledPattern
+from game.player import MAX_PLAYERS
+
+
+class BitBoard(Board):
+    matcher_kind = None
+
+    def __init__(self, width: int, height: int, player_count: int = MAX_PLAYERS):
+        super().__init__(width, height, player_count)
+        self.stride = self.width * 2 - 1
+        self.full_mask = 0
+        row_mask = (1 << self.width) - 1
+        for y in range(self.height):
+            self.full_mask |= row_mask << (y * self.stride)
+
+    def _clear_cells(self):
+        self.masks: Dict[int, int] = {}
+        self.occupied = 0
+        self._match_cache: Dict[Tuple[int, Tuple[Tuple[int, int], ...]], int] = {}
+
+    def _bit_index(self, x: int, y: int) -> int:
+        return y * self.stride + x
+
+    def is_empty(self, x: int, y: int) -> bool:
+        if not self.is_valid_position(x, y):
+            return False
+        return not (self.occupied >> self._bit_index(x, y)) & 1
+
+    def get_cell(self, x: int, y: int) -> Optional[int]:
+        if not self.is_valid_position(x, y):
+            return None
+        index = self._bit_index(x, y)
+        if not (self.occupied >> index) & 1:
+            return None
+        for player_id, mask in self.masks.items():
+            if (mask >> index) & 1:
+                return player_id
+        return None
+
+    def _set_cell(self, x: int, y: int, player_id: Optional[int]):
+        bit = 1 << self._bit_index(x, y)
+        for owner in self.masks:
+            self.masks[owner] &= ~bit
+        self.occupied &= ~bit
+        if player_id is not None:
+            self.masks[player_id] = self.masks.get(player_id, 0) | bit
+            self.occupied |= bit
+        self._match_cache.clear()
+
+    def count_in_direction(self, x: int, y: int, dx: int, dy: int, player_id: int) -> int:
+        mask = self.masks.get(player_id, 0)
+        count = 0
+        cx, cy = x + dx, y + dy
+        while self.is_valid_position(cx, cy) and (mask >> self._bit_index(cx, cy)) & 1:
+            count += 1
+            cx += dx
+            cy += dy
+        return count
+
+    def get_match_mask(self, player_id: int, transformed: Tuple[Tuple[int, int], ...]) -> int:
+        key = (player_id, transformed)
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            return cached
+        mask = self.masks.get(player_id, 0)
+        match = self.full_mask
+        for px, py in transformed:
+            if px >= self.width or py >= self.height:
+                match = 0
+                break
+            match &= mask >> (py * self.stride + px)
+            if not match:
+                break
+        self._match_cache[key] = match
+        return match
+
+    def _check_transformations_at(self, x: int, y: int, player_id: int, pattern: CompiledPattern) -> Optional[List[Tuple[int, int]]]:
+        for transformed in pattern.transformations:
+            match = self.get_match_mask(player_id, transformed)
+            if not match:
+                continue
+            for offset_x, offset_y in transformed:
+                base_x = x - offset_x
+                base_y = y - offset_y
+                if base_x < 0 or base_y < 0:
+                    continue
+                if (match >> self._bit_index(base_x, base_y)) & 1:
+                    return [(base_x + px, base_y + py) for px, py in transformed]
+        return None
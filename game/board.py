@@ -1,7 +1,17 @@
-from typing import Optional, List, Tuple, Set
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Dict, Optional, List, Tuple, Set, Union
+from game.player import MAX_PLAYERS
 
 MIN_BOARD_SIZE = 5
 MAX_BOARD_SIZE = 50
+SPARSE_MAX_BOARD_SIZE = 1_000_000
+
+DEFAULT_WIN_PATTERNS = [
+    {"enabled": True, "cells": [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)]},
+    {"enabled": True, "cells": [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4)]}
+]
 
 _transformation_cache = {}
 _offset_cache = {}
@@ -64,13 +74,220 @@ def normalize_pattern(cells: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
     return sorted((x - min_x, y - min_y) for x, y in cells)
 
 
-class Board:
-    def __init__(self, width: int, height: int):
-        self.width = max(MIN_BOARD_SIZE, min(width, MAX_BOARD_SIZE))
-        self.height = max(MIN_BOARD_SIZE, min(height, MAX_BOARD_SIZE))
-        self.grid: List[List[Optional[int]]] = [
-            [None for _ in range(self.width)] for _ in range(self.height)
+def get_pattern_cells(pattern: dict) -> List[Tuple[int, int]]:
+    pattern_cells = []
+    for cell in pattern.get("cells", []):
+        if cell is None or len(cell) != 2:
+            continue
+        try:
+            cx = int(cell[0])
+            cy = int(cell[1])
+        except (TypeError, ValueError):
+            continue
+        pattern_cells.append((cx, cy))
+    return pattern_cells
+
+
+def get_line_info(cells: List[Tuple[int, int]]) -> Optional[Tuple[int, int, int]]:
+    if len(cells) < 2:
+        return None
+    xs = [x for x, _ in cells]
+    ys = [y for _, y in cells]
+    length = len(cells)
+    if all(y == ys[0] for y in ys):
+        xs_sorted = sorted(set(xs))
+        if len(xs_sorted) == length and xs_sorted == list(range(xs_sorted[0], xs_sorted[0] + length)):
+            return (1, 0, length)
+    if all(x == xs[0] for x in xs):
+        ys_sorted = sorted(set(ys))
+        if len(ys_sorted) == length and ys_sorted == list(range(ys_sorted[0], ys_sorted[0] + length)):
+            return (0, 1, length)
+    if all((x - y) == (xs[0] - ys[0]) for x, y in cells):
+        points = sorted(cells, key=lambda p: p[0])
+        if all(points[i + 1][0] - points[i][0] == 1 and points[i + 1][1] - points[i][1] == 1 for i in range(length - 1)):
+            return (1, 1, length)
+    if all((x + y) == (xs[0] + ys[0]) for x, y in cells):
+        points = sorted(cells, key=lambda p: p[0])
+        if all(points[i + 1][0] - points[i][0] == 1 and points[i + 1][1] - points[i][1] == -1 for i in range(length - 1)):
+            return (1, -1, length)
+    return None
+
+
+@dataclass
+class CompiledPattern:
+    cells: Tuple[Tuple[int, int], ...]
+    line_info: Optional[Tuple[int, int, int]]
+    transformations: List[Tuple[Tuple[int, int], ...]]
+    sizes: List[Tuple[int, int]]
+    anchors: List[List[Tuple[int, int, Tuple[Tuple[int, int], ...]]]]
+    shape: Tuple[Tuple[int, int], ...]
+
+
+def compile_pattern(pattern_cells: List[Tuple[int, int]]) -> CompiledPattern:
+    cells_tuple = tuple(sorted(pattern_cells))
+    transformations = get_pattern_transformations_cached(cells_tuple)
+    sizes = []
+    anchors = []
+    for transformed in transformations:
+        sizes.append((max(px for px, _ in transformed) + 1, max(py for _, py in transformed) + 1))
+        anchors.append([
+            (ox, oy, tuple((px - ox, py - oy) for px, py in transformed))
+            for ox, oy in transformed
+        ])
+    return CompiledPattern(
+        cells=cells_tuple,
+        line_info=get_line_info(normalize_pattern(pattern_cells)),
+        transformations=transformations,
+        sizes=sizes,
+        anchors=anchors,
+        shape=min(transformations),
+    )
+
+
+_compiled_cache = {}
+
+
+def get_patterns_fingerprint(patterns: List[CompiledPattern]) -> int:
+    shapes = sorted(set(pattern.shape for pattern in patterns))
+    digest = hashlib.blake2b(repr(shapes).encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class CompiledPatternSet:
+    def __init__(self, patterns: List[dict] = None):
+        if patterns is None:
+            patterns = DEFAULT_WIN_PATTERNS
+        self.patterns: List[CompiledPattern] = []
+        for pattern in patterns:
+            if not pattern.get("enabled", True):
+                continue
+            pattern_cells = get_pattern_cells(pattern)
+            if not pattern_cells:
+                continue
+            self.patterns.append(compile_pattern(pattern_cells))
+        self.extent = max((max(max(size) for size in p.sizes) for p in self.patterns), default=0)
+        self.fingerprint = get_patterns_fingerprint(self.patterns)
+        self.matchers: Dict[str, object] = {}
+
+    @classmethod
+    def from_patterns(cls, patterns: List[dict] = None) -> "CompiledPatternSet":
+        if patterns is None:
+            patterns = DEFAULT_WIN_PATTERNS
+        key = tuple(
+            tuple(get_pattern_cells(pattern))
+            for pattern in patterns
+            if pattern.get("enabled", True)
+        )
+        compiled = _compiled_cache.get(key)
+        if compiled is None:
+            compiled = cls(patterns)
+            _compiled_cache[key] = compiled
+        return compiled
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["matchers"] = {}
+        return state
+
+    def get_multi_matcher(self, kind: str):
+        key = "multi:" + kind
+        if key not in self.matchers:
+            from game.matchers import get_multi_matcher
+            self.matchers[key] = get_multi_matcher(self, kind)
+        return self.matchers[key]
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+BOARD_BACKENDS = ("grid", "bitboard", "numpy", "sparse")
+
+
+def create_board(width: int, height: int, backend: str = "grid", player_count: int = MAX_PLAYERS) -> "Board":
+    if backend == "bitboard":
+        from game.bitboard import BitBoard
+        return BitBoard(width, height, player_count)
+    if backend == "numpy":
+        from game.numpy_engine import NUMPY_AVAILABLE, NumpyBoard
+        if NUMPY_AVAILABLE:
+            return NumpyBoard(width, height, player_count)
+    if backend == "sparse":
+        from game.sparse_board import SparseBoard
+        return SparseBoard(width, height, player_count)
+    return Board(width, height, player_count)
+
+
+def get_max_board_size(backend: str = "grid") -> int:
+    if backend == "sparse":
+        return SPARSE_MAX_BOARD_SIZE
+    return MAX_BOARD_SIZE
+
+
+_zobrist_cache = {}
+
+SYMMETRY_INVERSES = (0, 1, 2, 3, 4, 6, 5, 7)
+
+
+Symmetry = Tuple[int, int, int, int, int, int]
+
+
+def get_board_symmetries(width: int, height: int) -> List[Symmetry]:
+    max_x = width - 1
+    max_y = height - 1
+    symmetries = [
+        (1, 0, 0, 0, 1, 0),
+        (-1, 0, max_x, 0, 1, 0),
+        (1, 0, 0, 0, -1, max_y),
+        (-1, 0, max_x, 0, -1, max_y),
+    ]
+    if width == height:
+        symmetries += [
+            (0, 1, 0, 1, 0, 0),
+            (0, -1, max_y, 1, 0, 0),
+            (0, 1, 0, -1, 0, max_x),
+            (0, -1, max_y, -1, 0, max_x),
+        ]
+    return symmetries
+
+
+def apply_symmetry(symmetry: Symmetry, x: int, y: int) -> Tuple[int, int]:
+    xx, xy, x0, yx, yy, y0 = symmetry
+    return xx * x + xy * y + x0, yx * x + yy * y + y0
+
+
+def get_zobrist_keys(width: int, height: int, player_count: int) -> List[List[int]]:
+    key = (width, height, player_count)
+    if key not in _zobrist_cache:
+        rng = random.Random(f"zobrist:{width}x{height}:{player_count}")
+        _zobrist_cache[key] = [
+            [rng.getrandbits(64) for _ in range(width * height)]
+            for _ in range(player_count)
         ]
+    return _zobrist_cache[key]
+
+
+class Board:
+    max_size = MAX_BOARD_SIZE
+    zobrist_scheme = 0
+    matcher_kind: Optional[str] = "grid"
+
+    def __init__(self, width: int, height: int, player_count: int = MAX_PLAYERS):
+        self.width = max(MIN_BOARD_SIZE, min(width, self.max_size))
+        self.height = max(MIN_BOARD_SIZE, min(height, self.max_size))
+        self.player_count = max(1, player_count)
+        self.symmetries: Optional[List[Symmetry]] = None
+        self.frontier_radius = 0
+        self._init_zobrist()
+        self.reset()
+
+    def _init_zobrist(self):
+        self._zobrist_keys = get_zobrist_keys(self.width, self.height, self.player_count)
+
+    def get_zobrist_key(self, x: int, y: int, player_id: int) -> int:
+        return self._zobrist_keys[player_id][y * self.width + x]
     
     def is_valid_position(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
@@ -90,18 +307,136 @@ class Board:
             return False
         if not self.is_empty(x, y):
             return False
-        self.grid[y][x] = player_id
+        self._set_cell(x, y, player_id)
+        self.player_stones.setdefault(player_id, set()).add((x, y))
+        self.stone_count += 1
+        self._zobrist_hash ^= self.get_zobrist_key(x, y, player_id)
+        if self.symmetries is not None:
+            self._toggle_symmetry_hashes(x, y, player_id)
+        if self.frontier_radius:
+            self._add_to_frontier(x, y)
+        return True
+
+    def remove_figure(self, x: int, y: int) -> bool:
+        player_id = self.get_cell(x, y)
+        if player_id is None:
+            return False
+        self._set_cell(x, y, None)
+        self.player_stones[player_id].discard((x, y))
+        self.stone_count -= 1
+        self._zobrist_hash ^= self.get_zobrist_key(x, y, player_id)
+        if self.symmetries is not None:
+            self._toggle_symmetry_hashes(x, y, player_id)
+        if self.frontier_radius:
+            self._remove_from_frontier(x, y)
         return True
+
+    @property
+    def zobrist_hash(self) -> int:
+        return self._zobrist_hash
+
+    def enable_symmetry_hashes(self):
+        if self.symmetries is not None:
+            return
+        self.symmetries = get_board_symmetries(self.width, self.height)
+        self._symmetry_hashes = [0] * len(self.symmetries)
+        for x, y, player_id in self.iter_stones():
+            self._toggle_symmetry_hashes(x, y, player_id)
+
+    def _toggle_symmetry_hashes(self, x: int, y: int, player_id: int):
+        hashes = self._symmetry_hashes
+        for i, (xx, xy, x0, yx, yy, y0) in enumerate(self.symmetries):
+            hashes[i] ^= self.get_zobrist_key(xx * x + xy * y + x0, yx * x + yy * y + y0, player_id)
+
+    def set_frontier_radius(self, radius: int):
+        self.frontier_radius = max(0, radius)
+        self._clear_frontier()
+        if self.frontier_radius:
+            for x, y, _ in self.iter_stones():
+                self._add_to_frontier(x, y)
+
+    def _clear_frontier(self):
+        self.frontier_counts: Dict[int, int] = {}
+        self.frontier: Set[int] = set()
+        self._frontier_order: Optional[List[Tuple[int, int]]] = None
+
+    def _add_to_frontier(self, x: int, y: int):
+        counts = self.frontier_counts
+        frontier = self.frontier
+        radius = self.frontier_radius
+        width = self.width
+        index = y * width + x
+        frontier.discard(index)
+        min_x = max(0, x - radius)
+        max_x = min(width, x + radius + 1)
+        for cy in range(max(0, y - radius), min(self.height, y + radius + 1)):
+            row = cy * width
+            for cell in range(row + min_x, row + max_x):
+                count = counts.get(cell, 0)
+                counts[cell] = count + 1
+                if not count and cell != index:
+                    frontier.add(cell)
+        self._frontier_order = None
+
+    def _remove_from_frontier(self, x: int, y: int):
+        counts = self.frontier_counts
+        frontier = self.frontier
+        radius = self.frontier_radius
+        width = self.width
+        min_x = max(0, x - radius)
+        max_x = min(width, x + radius + 1)
+        for cy in range(max(0, y - radius), min(self.height, y + radius + 1)):
+            row = cy * width
+            for cell in range(row + min_x, row + max_x):
+                count = counts[cell] - 1
+                if count:
+                    counts[cell] = count
+                else:
+                    del counts[cell]
+                    frontier.discard(cell)
+        index = y * width + x
+        if index in counts:
+            frontier.add(index)
+        self._frontier_order = None
+
+    def get_frontier(self) -> List[Tuple[int, int]]:
+        if self._frontier_order is None:
+            width = self.width
+            self._frontier_order = [(index % width, index // width) for index in sorted(self.frontier)]
+        return self._frontier_order
+
+    def get_canonical_hash(self) -> Tuple[int, int]:
+        if self.symmetries is None:
+            return self._zobrist_hash, 0
+        hashes = self._symmetry_hashes
+        index = min(range(len(hashes)), key=hashes.__getitem__)
+        return hashes[index], index
+
+    def _set_cell(self, x: int, y: int, player_id: Optional[int]):
+        self.grid[y][x] = player_id
     
+    def iter_stones(self):
+        for player_id, cells in self.player_stones.items():
+            for x, y in cells:
+                yield x, y, player_id
+
+    def get_stones(self, player_id: int) -> Set[Tuple[int, int]]:
+        return self.player_stones.get(player_id, set())
+
     def is_full(self) -> bool:
-        for row in self.grid:
-            for cell in row:
-                if cell is None:
-                    return False
-        return True
+        return self.stone_count >= self.width * self.height
     
     def reset(self):
-        self.grid = [
+        self._clear_cells()
+        self.player_stones: Dict[int, Set[Tuple[int, int]]] = {}
+        self.stone_count = 0
+        self._zobrist_hash = 0
+        if self.symmetries is not None:
+            self._symmetry_hashes = [0] * len(self.symmetries)
+        self._clear_frontier()
+
+    def _clear_cells(self):
+        self.grid: List[List[Optional[int]]] = [
             [None for _ in range(self.width)] for _ in range(self.height)
         ]
     
@@ -114,106 +449,72 @@ class Board:
             cy += dy
         return count
     
-    def check_win_at(self, x: int, y: int, player_id: int, patterns: List[dict] = None) -> Optional[List[Tuple[int, int]]]:
-        if patterns is None:
-            patterns = [
-                {"enabled": True, "cells": [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)]},
-                {"enabled": True, "cells": [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4)]}
-            ]
-        
-        grid = self.grid
-        width = self.width
-        height = self.height
+    def check_win_at(self, x: int, y: int, player_id: int, patterns: Union[List[dict], CompiledPatternSet] = None) -> Optional[List[Tuple[int, int]]]:
+        if not isinstance(patterns, CompiledPatternSet):
+            patterns = CompiledPatternSet.from_patterns(patterns)
+        if self.matcher_kind:
+            multi_matcher = patterns.get_multi_matcher(self.matcher_kind)
+            if multi_matcher is not None:
+                return self._check_win_multi(x, y, player_id, patterns, multi_matcher)
         
         for pattern in patterns:
-            if not pattern.get("enabled", True):
-                continue
-            
-            raw_cells = pattern.get("cells", [])
-            pattern_cells = []
-            for cell in raw_cells:
-                if cell is None or len(cell) != 2:
-                    continue
-                try:
-                    cx = int(cell[0])
-                    cy = int(cell[1])
-                except (TypeError, ValueError):
-                    continue
-                pattern_cells.append((cx, cy))
-            if not pattern_cells:
-                continue
-
-            normalized = normalize_pattern(pattern_cells)
-            line_info = self._get_line_info(normalized)
-            if line_info:
-                dx, dy, length = line_info
-                if self.grid[y][x] == player_id:
-                    total = 1 + self.count_in_direction(x, y, dx, dy, player_id) + self.count_in_direction(x, y, -dx, -dy, player_id)
-                    if total >= length:
-                        start_x = x - dx * self.count_in_direction(x, y, -dx, -dy, player_id)
-                        start_y = y - dy * self.count_in_direction(x, y, -dx, -dy, player_id)
-                        winning_cells = []
-                        cx, cy = start_x, start_y
-                        for _ in range(total):
-                            winning_cells.append((cx, cy))
-                            cx += dx
-                            cy += dy
-                        return winning_cells[:length]
+            if pattern.line_info:
+                winning_cells = self._check_line_at(x, y, player_id, pattern.line_info)
+                if winning_cells:
+                    return winning_cells
             
-            cells_tuple = tuple(sorted(pattern_cells))
-            transformations = get_pattern_transformations_cached(cells_tuple)
-            pattern_size = len(pattern_cells)
-            
-            for transformed in transformations:
-                for offset_x, offset_y in transformed:
-                    base_x = x - offset_x
-                    base_y = y - offset_y
-                    
-                    if base_x < 0 or base_y < 0:
-                        continue
-                    
-                    match = True
-                    winning_cells = []
-                    
-                    for px, py in transformed:
-                        check_x = base_x + px
-                        check_y = base_y + py
-                        
-                        if check_x >= width or check_y >= height:
-                            match = False
-                            break
-                        
-                        if grid[check_y][check_x] != player_id:
-                            match = False
-                            break
-                        
-                        winning_cells.append((check_x, check_y))
-                    
-                    if match and len(winning_cells) == pattern_size:
-                        return winning_cells
+            winning_cells = self._check_transformations_at(x, y, player_id, pattern)
+            if winning_cells:
+                return winning_cells
         
         return None
 
-    def _get_line_info(self, cells: List[Tuple[int, int]]) -> Optional[Tuple[int, int, int]]:
-        if len(cells) < 2:
+    def _check_win_multi(self, x: int, y: int, player_id: int, patterns: CompiledPatternSet, matcher) -> Optional[List[Tuple[int, int]]]:
+        found = matcher.match(self._get_matcher_cells(), x, y, player_id, self.width, self.height)
+        if found is None:
+            return None
+        pattern_index, winning_cells = found
+        line_info = patterns.patterns[pattern_index].line_info
+        if line_info:
+            line_cells = self._check_line_at(x, y, player_id, line_info)
+            if line_cells:
+                return line_cells
+        return winning_cells
+
+    def _get_matcher_cells(self):
+        return self.grid
+
+    def _check_line_at(self, x: int, y: int, player_id: int, line_info: Tuple[int, int, int]) -> Optional[List[Tuple[int, int]]]:
+        dx, dy, length = line_info
+        if self.get_cell(x, y) != player_id:
+            return None
+        backward = self.count_in_direction(x, y, -dx, -dy, player_id)
+        total = 1 + self.count_in_direction(x, y, dx, dy, player_id) + backward
+        if total < length:
             return None
-        xs = [x for x, _ in cells]
-        ys = [y for _, y in cells]
-        length = len(cells)
-        if all(y == ys[0] for y in ys):
-            xs_sorted = sorted(set(xs))
-            if len(xs_sorted) == length and xs_sorted == list(range(xs_sorted[0], xs_sorted[0] + length)):
-                return (1, 0, length)
-        if all(x == xs[0] for x in xs):
-            ys_sorted = sorted(set(ys))
-            if len(ys_sorted) == length and ys_sorted == list(range(ys_sorted[0], ys_sorted[0] + length)):
-                return (0, 1, length)
-        if all((x - y) == (xs[0] - ys[0]) for x, y in cells):
-            points = sorted(cells, key=lambda p: p[0])
-            if all(points[i + 1][0] - points[i][0] == 1 and points[i + 1][1] - points[i][1] == 1 for i in range(length - 1)):
-                return (1, 1, length)
-        if all((x + y) == (xs[0] + ys[0]) for x, y in cells):
-            points = sorted(cells, key=lambda p: p[0])
-            if all(points[i + 1][0] - points[i][0] == 1 and points[i + 1][1] - points[i][1] == -1 for i in range(length - 1)):
-                return (1, -1, length)
+        start_x = x - dx * backward
+        start_y = y - dy * backward
+        return [(start_x + dx * i, start_y + dy * i) for i in range(length)]
+
+    def _check_transformations_at(self, x: int, y: int, player_id: int, pattern: CompiledPattern) -> Optional[List[Tuple[int, int]]]:
+        grid = self.grid
+        width = self.width
+        height = self.height
+        
+        for (size_x, size_y), anchors in zip(pattern.sizes, pattern.anchors):
+            for offset_x, offset_y, offsets in anchors:
+                base_x = x - offset_x
+                base_y = y - offset_y
+                
+                if base_x < 0 or base_y < 0 or base_x + size_x > width or base_y + size_y > height:
+                    continue
+                
+                winning_cells = []
+                for dx, dy in offsets:
+                    if grid[y + dy][x + dx] != player_id:
+                        break
+                    winning_cells.append((x + dx, y + dy))
+                else:
+                    return winning_cells
+        
         return None
@@ -0,0 +1,120 @@
+import os
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from game.alphabeta import AlphaBetaBot
+from game.mcts import MCTSBot
+from game.rules import GameRules
+
+
+class RandomBot:
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def get_candidates(self, rules: GameRules) -> List[Tuple[int, int]]:
+        return list(rules.board.get_frontier())
+
+    def random_empty_cell(self, rules: GameRules, exclude: set) -> Optional[Tuple[int, int]]:
+        board = rules.board
+        for _ in range(64):
+            cell = (self.rng.randrange(board.width), self.rng.randrange(board.height))
+            if cell not in exclude and board.is_empty(*cell):
+                return cell
+        if board.width * board.height > 10000:
+            return None
+        empty = [
+            (x, y) for y in range(board.height) for x in range(board.width)
+            if (x, y) not in exclude and board.is_empty(x, y)
+        ]
+        return self.rng.choice(empty) if empty else None
+
+    def random_frontier_cell(self, frontier: List[Tuple[int, int]], exclude: set) -> Optional[Tuple[int, int]]:
+        for _ in range(16):
+            cell = self.rng.choice(frontier)
+            if cell not in exclude:
+                return cell
+        return None
+
+    def choose_turn(self, rules: GameRules, should_stop: Optional[Callable[[], bool]] = None) -> List[Tuple[int, int]]:
+        frontier = rules.board.get_frontier()
+        moves = []
+        while len(moves) < rules.MAX_MOVES_PER_TURN:
+            cell = None
+            if frontier and self.rng.random() < 0.9:
+                cell = self.random_frontier_cell(frontier, set(moves))
+            if cell is None:
+                cell = self.random_empty_cell(rules, set(moves))
+            if cell is None:
+                break
+            moves.append(cell)
+        return moves
+
+
+class GreedyBot(RandomBot):
+    def score_cell(self, rules: GameRules, x: int, y: int, player_id: int) -> float:
+        tracker = rules.live_windows
+        score = 0.0
+        for key in tracker.iter_windows_at(x, y):
+            owners = tracker.stones.get(key)
+            if owners is None:
+                score += 1.0
+            elif len(owners) == 1:
+                count = next(iter(owners.values()))
+                weight = 4.0 ** count
+                score += weight * (1.5 if player_id in owners else 1.0)
+        return score
+
+    def choose_turn(self, rules: GameRules, should_stop: Optional[Callable[[], bool]] = None) -> List[Tuple[int, int]]:
+        player_id = rules.get_current_player().player_id
+        candidates = self.get_candidates(rules)
+        if not candidates:
+            cell = self.random_empty_cell(rules, set())
+            candidates = [cell] if cell else []
+        moves = []
+        board = rules.board
+        while candidates and len(moves) < rules.MAX_MOVES_PER_TURN:
+            best = max(candidates, key=lambda c: (self.score_cell(rules, c[0], c[1], player_id), self.rng.random()))
+            candidates.remove(best)
+            moves.append(best)
+            board.place_figure(best[0], best[1], player_id)
+            rules.live_windows.add_stone(best[0], best[1], player_id)
+        for x, y in reversed(moves):
+            rules.live_windows.remove_stone(x, y, player_id)
+            board.remove_figure(x, y)
+        return moves
+
+
+BOTS: Dict[str, type] = {
+    "random": RandomBot,
+    "greedy": GreedyBot,
+    "alphabeta": AlphaBetaBot,
+    "mcts": MCTSBot,
+}
+
+
+def create_bot(name: str, seed: Optional[int] = None, **options):
+    if name not in BOTS:
+        raise ValueError(f"Неизвестный бот: {name}")
+    return BOTS[name](seed=seed, **options)
+
+
+_worker_bots: Dict[int, object] = {}
+_worker_cancelled = None
+
+
+def init_bot_worker(cancelled):
+    global _worker_cancelled
+    _worker_cancelled = cancelled
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+def compute_bot_turn(key: int, name: str, options: dict, rules: GameRules, token: int = 0) -> Tuple[List[Tuple[int, int]], dict]:
+    bot = _worker_bots.get(key)
+    if bot is None:
+        bot = _worker_bots[key] = create_bot(name, **options)
+    should_stop = None
+    if _worker_cancelled is not None and token:
+        should_stop = lambda: _worker_cancelled.value >= token
+    rules.live_windows.disable_near_cells()
+    moves = bot.choose_turn(rules, should_stop)
+    return moves, dict(getattr(bot, "last_stats", {}))
@@ -0,0 +1,373 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game.board import MIN_BOARD_SIZE, Board, CompiledPatternSet, create_board
+from game.matchers import clear_matcher_caches, random_shape
+from game.numpy_engine import NUMPY_AVAILABLE, check_positions
+from game.player import AVAILABLE_COLORS, AVAILABLE_FIGURES, MAX_PLAYERS, Player
+from game.rules import GameRules
+
+Case = dict
+EngineFactory = Callable[[int, int, int], Board]
+
+ENGINES: Dict[str, EngineFactory] = {}
+RULES_ENGINES: Dict[str, EngineFactory] = {}
+
+
+def register_engine(name: str, factory: EngineFactory, rules: bool = False):
+    ENGINES[name] = factory
+    if rules:
+        RULES_ENGINES[name] = factory
+
+
+def make_engine(backend: str, matcher_kind: Optional[str] = "default") -> EngineFactory:
+    def factory(width: int, height: int, player_count: int) -> Board:
+        board = create_board(width, height, backend, player_count)
+        if matcher_kind != "default":
+            board.matcher_kind = matcher_kind
+        return board
+    return factory
+
+
+def create_reference_board(width: int, height: int, player_count: int) -> Board:
+    board = Board(width, height, player_count)
+    board.matcher_kind = None
+    return board
+
+
+register_engine("grid", make_engine("grid"), rules=True)
+register_engine("sparse", make_engine("sparse"), rules=True)
+register_engine("sparse-generic", make_engine("sparse", matcher_kind=None))
+register_engine("bitboard", make_engine("bitboard"), rules=True)
+if NUMPY_AVAILABLE:
+    register_engine("numpy", make_engine("numpy"), rules=True)
+
+
+def random_dihedral(cells: List[Tuple[int, int]], rng: random.Random) -> List[Tuple[int, int]]:
+    if rng.random() < 0.5:
+        cells = [(-x, y) for x, y in cells]
+    for _ in range(rng.randrange(4)):
+        cells = [(-y, x) for x, y in cells]
+    min_x = min(x for x, _ in cells)
+    min_y = min(y for _, y in cells)
+    return [(x - min_x, y - min_y) for x, y in cells]
+
+
+def random_pattern(rng: random.Random, max_cells: int) -> List[Tuple[int, int]]:
+    size = rng.randint(1, max_cells)
+    if rng.random() < 0.3:
+        dx, dy = rng.choice(((1, 0), (1, 1)))
+        cells = [(i * dx, i * dy) for i in range(size)]
+    else:
+        cells = random_shape(rng, size)
+    return random_dihedral(cells, rng)
+
+
+def random_patterns(rng: random.Random, config: dict) -> List[List[Tuple[int, int]]]:
+    return [random_pattern(rng, config["max_cells"]) for _ in range(rng.randint(1, config["patterns"]))]
+
+
+def random_case(rng: random.Random, config: dict, patterns: List[List[Tuple[int, int]]]) -> Case:
+    width = rng.randint(MIN_BOARD_SIZE, config["max_size"])
+    height = rng.randint(MIN_BOARD_SIZE, config["max_size"])
+    players = rng.randint(1, config["players"])
+    density = rng.uniform(0.0, config["density"])
+    stones = [
+        (x, y, rng.randrange(players))
+        for y in range(height)
+        for x in range(width)
+        if rng.random() < density
+    ]
+    return {"width": width, "height": height, "players": players, "patterns": patterns, "stones": stones}
+
+
+def build_board(factory: EngineFactory, case: Case) -> Board:
+    board = factory(case["width"], case["height"], case["players"])
+    for x, y, player_id in case["stones"]:
+        board.place_figure(x, y, player_id)
+    return board
+
+
+def get_rules_reference(board: Board, patterns: CompiledPatternSet, player_id: int) -> Optional[List[Tuple[int, int]]]:
+    for x, y in sorted(board.get_stones(player_id), key=lambda cell: (cell[1], cell[0])):
+        win_cells = board.check_win_at(x, y, player_id, patterns)
+        if win_cells:
+            return win_cells
+    return None
+
+
+def has_earlier_win(board: Board, patterns: CompiledPatternSet, moves: List[Tuple[int, int]], player_id: int) -> bool:
+    for x, y in moves:
+        board.remove_figure(x, y)
+    try:
+        return get_rules_reference(board, patterns, player_id) is not None
+    finally:
+        for x, y in moves:
+            board.place_figure(x, y, player_id)
+
+
+def create_context(patterns: List[List[Tuple[int, int]]]) -> dict:
+    return {"patterns": CompiledPatternSet([{"cells": cells} for cells in patterns]), "rules": {}}
+
+
+def get_case_rules(context: dict, name: str, case: Case, board: Board, players: List[Player]) -> GameRules:
+    key = (name, case["players"], case["width"], case["height"])
+    rules = context["rules"].get(key)
+    if rules is None:
+        empty = ENGINES[name](case["width"], case["height"], case["players"])
+        rules = context["rules"][key] = GameRules(empty, players, [{"cells": cells} for cells in case["patterns"]])
+    rules.board = board
+    for moves in rules.unchecked_moves:
+        moves.clear()
+    return rules
+
+
+def check_case(case: Case, engines: Optional[List[str]] = None, context: Optional[dict] = None) -> Tuple[Optional[str], int]:
+    if context is None:
+        context = create_context(case["patterns"])
+    patterns = context["patterns"]
+    reference = build_board(create_reference_board, case)
+    names = list(ENGINES) if engines is None else engines
+    boards = {name: build_board(ENGINES[name], case) for name in names}
+    checks = 0
+
+    expected_wins = {}
+    for x, y, player_id in case["stones"]:
+        expected = reference.check_win_at(x, y, player_id, patterns)
+        expected_wins[player_id] = expected_wins.get(player_id, False) or expected is not None
+        for name, board in boards.items():
+            actual = board.check_win_at(x, y, player_id, patterns)
+            checks += 1
+            if actual != expected:
+                return f"{name}: check_win_at({x}, {y}, {player_id}) = {actual}, ожидалось {expected}", checks
+
+    if NUMPY_AVAILABLE and (engines is None or "numpy-batch" in engines):
+        position = [[-1] * case["width"] for _ in range(case["height"])]
+        for x, y, player_id in case["stones"]:
+            position[y][x] = player_id
+        for player_id in range(case["players"]):
+            actual = check_positions([position], player_id, patterns)[0]
+            checks += 1
+            if actual != expected_wins.get(player_id, False):
+                return f"numpy-batch: check_positions(игрок {player_id}) = {actual}", checks
+
+    if not any(name in RULES_ENGINES for name in names):
+        return None, checks
+    players = [
+        Player(player_id=i, name=str(i), figure=AVAILABLE_FIGURES[i], color=AVAILABLE_COLORS[i])
+        for i in range(case["players"])
+    ]
+    last_turns = {}
+    for player in players:
+        moves = [(x, y) for x, y, player_id in case["stones"] if player_id == player.player_id][-3:]
+        if not has_earlier_win(reference, patterns, moves, player.player_id):
+            last_turns[player.player_id] = (moves, get_rules_reference(reference, patterns, player.player_id))
+    for name in names:
+        if name not in RULES_ENGINES or not last_turns:
+            continue
+        rules = get_case_rules(context, name, case, boards[name], players)
+        for index, player in enumerate(rules.players):
+            if player.player_id not in last_turns:
+                continue
+            moves, expected = last_turns[player.player_id]
+            rules.game_over = False
+            rules.winner = None
+            rules.winning_cells = []
+            rules.last_player_index = index
+            rules.unchecked_moves[index] = list(moves)
+            won, _ = rules.check_winner()
+            checks += 1
+            actual = rules.winning_cells if won else None
+            if won != (expected is not None) or actual != expected:
+                return f"{name}: check_winner(игрок {index}) = {actual}, ожидалось {expected}", checks
+    return None, checks
+
+
+def crop_case(case: Case) -> Case:
+    stones = case["stones"]
+    if not stones:
+        return dict(case, width=MIN_BOARD_SIZE, height=MIN_BOARD_SIZE)
+    min_x = min(x for x, _, _ in stones)
+    min_y = min(y for _, y, _ in stones)
+    max_x = max(x for x, _, _ in stones)
+    max_y = max(y for _, y, _ in stones)
+    return dict(
+        case,
+        width=max(MIN_BOARD_SIZE, max_x - min_x + 1),
+        height=max(MIN_BOARD_SIZE, max_y - min_y + 1),
+        stones=[(x - min_x, y - min_y, player_id) for x, y, player_id in stones],
+    )
+
+
+def shrink_case(case: Case, engines: Optional[List[str]] = None) -> Case:
+    def fails(candidate: Case) -> bool:
+        return check_case(candidate, engines)[0] is not None
+
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(case["patterns"]) - 1, -1, -1):
+            if len(case["patterns"]) > 1:
+                candidate = dict(case, patterns=case["patterns"][:i] + case["patterns"][i + 1:])
+                if fails(candidate):
+                    case, changed = candidate, True
+        for i in range(len(case["stones"]) - 1, -1, -1):
+            candidate = dict(case, stones=case["stones"][:i] + case["stones"][i + 1:])
+            if fails(candidate):
+                case, changed = candidate, True
+        for candidate in (
+            crop_case(case),
+            dict(case, width=case["width"] - 1),
+            dict(case, height=case["height"] - 1),
+        ):
+            if candidate["width"] < MIN_BOARD_SIZE or candidate["height"] < MIN_BOARD_SIZE:
+                continue
+            if any(x >= candidate["width"] or y >= candidate["height"] for x, y, _ in candidate["stones"]):
+                continue
+            if candidate != case and fails(candidate):
+                case, changed = candidate, True
+    return case
+
+
+def format_case(case: Case) -> str:
+    rows = []
+    occupied = {(x, y): player_id for x, y, player_id in case["stones"]}
+    for y in range(case["height"]):
+        rows.append("".join(str(occupied[(x, y)]) if (x, y) in occupied else "." for x in range(case["width"])))
+    return "\n".join(rows)
+
+
+def run_chunk(config: dict, chunk_index: int, cases: int) -> dict:
+    rng = random.Random(config["seed"] * 1_000_003 + chunk_index)
+    engines = config["engines"]
+    started = time.perf_counter()
+    checks = 0
+    failures = []
+    patterns = None
+    context = None
+    done = 0
+    for index in range(cases):
+        if index % config["positions_per_set"] == 0:
+            clear_matcher_caches()
+            patterns = random_patterns(rng, config)
+            context = create_context(patterns)
+        case = random_case(rng, config, patterns)
+        message, count = check_case(case, engines, context)
+        checks += count
+        done += 1
+        if message is not None:
+            case = shrink_case(case, engines)
+            message, _ = check_case(case, engines)
+            failures.append({"message": message, "case": case})
+            if len(failures) >= config["max_failures"]:
+                break
+    return {
+        "cases": done,
+        "checks": checks,
+        "failures": failures,
+        "duration": time.perf_counter() - started,
+        "worker": os.getpid(),
+    }
+
+
+def run_fuzz(config: dict, cases: int, workers: int, chunk_size: int) -> dict:
+    chunks = [min(chunk_size, cases - start) for start in range(0, cases, chunk_size)]
+    done_cases = 0
+    checks = 0
+    failures = []
+    started = time.perf_counter()
+
+    def record(result: dict):
+        nonlocal done_cases, checks
+        done_cases += result["cases"]
+        checks += result["checks"]
+        failures.extend(result["failures"])
+
+    if workers <= 1:
+        for index, count in enumerate(chunks):
+            record(run_chunk(config, index, count))
+            if len(failures) >= config["max_failures"]:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_chunk, config, index, count) for index, count in enumerate(chunks)]
+            for future in as_completed(futures):
+                record(future.result())
+                if len(failures) >= config["max_failures"]:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    elapsed = time.perf_counter() - started
+    return {
+        "cases": done_cases,
+        "checks": checks,
+        "failures": failures,
+        "elapsed": elapsed,
+        "cases_per_second": done_cases / elapsed if elapsed else 0.0,
+        "checks_per_second": checks / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Дифференциальная проверка движков поиска побед")
+    parser.add_argument("--cases", type=int, default=10000, help="Количество случайных позиций")
+    parser.add_argument("--max-size", type=int, default=12, help="Наибольший размер поля")
+    parser.add_argument("--density", type=float, default=0.6, help="Наибольшая доля занятых клеток")
+    parser.add_argument("--players", type=int, default=3, choices=range(1, MAX_PLAYERS + 1), help="Наибольшее количество игроков")
+    parser.add_argument("--patterns", type=int, default=4, help="Наибольшее количество фигур в наборе")
+    parser.add_argument("--max-cells", type=int, default=6, help="Наибольший размер фигуры")
+    parser.add_argument("--positions-per-set", type=int, default=200, help="Позиций на один набор фигур")
+    parser.add_argument("--engines", default=None, help=f"Движки через запятую ({', '.join(list(ENGINES) + ['numpy-batch'])})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Количество процессов")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Позиций в одной задаче")
+    parser.add_argument("--max-failures", type=int, default=1, help="Остановиться после стольких расхождений")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument("--output", default=None, help="Файл для итогов и найденных расхождений (.jsonl)")
+    args = parser.parse_args(argv)
+
+    engines = None
+    if args.engines:
+        engines = [name.strip() for name in args.engines.split(",") if name.strip()]
+        unknown = [name for name in engines if name not in ENGINES and name != "numpy-batch"]
+        if not engines or unknown:
+            parser.error(f"Неизвестные движки: {', '.join(unknown) or '-'}")
+    config = {
+        "max_size": max(MIN_BOARD_SIZE, args.max_size),
+        "density": min(1.0, max(0.0, args.density)),
+        "players": args.players,
+        "patterns": max(1, args.patterns),
+        "max_cells": max(1, args.max_cells),
+        "positions_per_set": max(1, args.positions_per_set),
+        "engines": engines,
+        "max_failures": max(1, args.max_failures),
+        "seed": args.seed,
+    }
+    summary = run_fuzz(config, max(0, args.cases), args.workers, max(1, args.chunk_size))
+
+    print(
+        f"Позиций: {summary['cases']}, проверок: {summary['checks']} за {summary['elapsed']:.2f} с "
+        f"({summary['cases_per_second']:.0f} позиций/с, {summary['checks_per_second']:.0f} проверок/с)"
+    )
+    for failure in summary["failures"]:
+        case = failure["case"]
+        print(f"Расхождение: {failure['message']}")
+        print(f"  поле {case['width']}x{case['height']}, фигуры: {case['patterns']}")
+        print("  " + format_case(case).replace("\n", "\n  "))
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            record = {key: value for key, value in summary.items() if key != "failures"}
+            record.update(seed=args.seed, engines=engines or list(ENGINES))
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            for failure in summary["failures"]:
+                f.write(json.dumps(failure, ensure_ascii=False) + "\n")
+    return 1 if summary["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
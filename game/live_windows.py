@@ -0,0 +1,177 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from game.board import CompiledPatternSet
+
+THREAT_BASE = 6
+THREAT_SPAN = 6
+
+
+def get_threat_weight(missing: int) -> int:
+    return THREAT_BASE ** (THREAT_SPAN - min(THREAT_SPAN, max(0, missing)))
+
+
+THREAT_WEIGHTS = [get_threat_weight(missing) for missing in range(THREAT_SPAN + 1)]
+
+
+class LiveWindowTracker:
+    def __init__(self, width: int, height: int, patterns: CompiledPatternSet, near_limit: int = 0):
+        self.width = width
+        self.height = height
+        self.near_limit = near_limit
+        self.windows: List[Tuple[Tuple[Tuple[int, int], ...], int, int]] = []
+        seen = set()
+        for pattern in patterns:
+            for transformed, (size_x, size_y) in zip(pattern.transformations, pattern.sizes):
+                if transformed in seen or size_x > width or size_y > height:
+                    continue
+                seen.add(transformed)
+                self.windows.append((transformed, size_x, size_y))
+        self.total = sum((width - size_x + 1) * (height - size_y + 1) for _, size_x, size_y in self.windows)
+        self.near_cells: Optional[Dict[int, List[Dict[Tuple[int, int], int]]]] = None
+        self.reset()
+
+    def reset(self):
+        self.stones: Dict[Tuple[int, int, int], Dict[int, int]] = {}
+        self.claimed = 0
+        self.sole: Dict[int, int] = {}
+        self.threat_scores: Dict[int, int] = {}
+        self.near_complete: Dict[int, Set[Tuple[int, int, int]]] = {}
+        if self.near_cells is not None:
+            self.near_cells = {}
+
+    def enable_near_cells(self):
+        if self.near_cells is not None:
+            return
+        self.near_cells = {}
+        for owner, keys in self.near_complete.items():
+            for key in keys:
+                self._add_near_cells(owner, key, self.get_window_size(key) - self.stones[key][owner])
+
+    def disable_near_cells(self):
+        self.near_cells = None
+
+    def _add_near_cells(self, owner: int, key: Tuple[int, int, int], missing: int):
+        levels = self.near_cells.get(owner)
+        if levels is None:
+            levels = self.near_cells[owner] = [{} for _ in range(self.near_limit + 1)]
+        counts = levels[missing]
+        for cell in self.get_window_cells(key):
+            counts[cell] = counts.get(cell, 0) + 1
+
+    def _remove_near_cells(self, owner: int, key: Tuple[int, int, int], missing: int):
+        counts = self.near_cells[owner][missing]
+        for cell in self.get_window_cells(key):
+            count = counts[cell] - 1
+            if count:
+                counts[cell] = count
+            else:
+                del counts[cell]
+
+    def iter_windows_at(self, x: int, y: int) -> Iterator[Tuple[int, int, int]]:
+        for index, (transformed, size_x, size_y) in enumerate(self.windows):
+            max_x = self.width - size_x
+            max_y = self.height - size_y
+            for offset_x, offset_y in transformed:
+                base_x = x - offset_x
+                base_y = y - offset_y
+                if 0 <= base_x <= max_x and 0 <= base_y <= max_y:
+                    yield index, base_x, base_y
+
+    def get_window_cells(self, key: Tuple[int, int, int]) -> List[Tuple[int, int]]:
+        index, base_x, base_y = key
+        transformed = self.windows[index][0]
+        return [(base_x + px, base_y + py) for px, py in transformed]
+
+    def get_window_size(self, key: Tuple[int, int, int]) -> int:
+        return len(self.windows[key[0]][0])
+
+    def add_stone(self, x: int, y: int, player_id: int):
+        for key in self.iter_windows_at(x, y):
+            owners = self.stones.get(key)
+            if owners is None:
+                owners = self.stones[key] = {}
+                self.claimed += 1
+            else:
+                self._leave(key, owners)
+            owners[player_id] = owners.get(player_id, 0) + 1
+            self._enter(key, owners)
+
+    def remove_stone(self, x: int, y: int, player_id: int):
+        for key in self.iter_windows_at(x, y):
+            owners = self.stones[key]
+            self._leave(key, owners)
+            count = owners[player_id] - 1
+            if count:
+                owners[player_id] = count
+            else:
+                del owners[player_id]
+                if not owners:
+                    del self.stones[key]
+                    self.claimed -= 1
+                    continue
+            self._enter(key, owners)
+
+    def _enter(self, key: Tuple[int, int, int], owners: Dict[int, int]):
+        if len(owners) != 1:
+            return
+        for owner, count in owners.items():
+            missing = self.get_window_size(key) - count
+            self.sole[owner] = self.sole.get(owner, 0) + 1
+            self.threat_scores[owner] = self.threat_scores.get(owner, 0) + THREAT_WEIGHTS[min(THREAT_SPAN, missing)]
+            if missing <= self.near_limit:
+                self.near_complete.setdefault(owner, set()).add(key)
+                if self.near_cells is not None:
+                    self._add_near_cells(owner, key, missing)
+
+    def _leave(self, key: Tuple[int, int, int], owners: Dict[int, int]):
+        if len(owners) != 1:
+            return
+        for owner, count in owners.items():
+            missing = self.get_window_size(key) - count
+            self.sole[owner] -= 1
+            self.threat_scores[owner] -= THREAT_WEIGHTS[min(THREAT_SPAN, missing)]
+            if missing <= self.near_limit:
+                self.near_complete[owner].discard(key)
+                if self.near_cells is not None:
+                    self._remove_near_cells(owner, key, missing)
+
+    def get_live_count(self, player_id: int) -> int:
+        return self.total - self.claimed + self.sole.get(player_id, 0)
+
+    def get_threat_score(self, player_id: int) -> int:
+        return self.threat_scores.get(player_id, 0)
+
+    def get_near_complete(self, player_id: int) -> Set[Tuple[int, int, int]]:
+        return self.near_complete.get(player_id, set())
+
+    def get_near_cells(
+        self, player_id: int, max_missing: int, pending: Iterable[Tuple[int, int]] = ()
+    ) -> Dict[Tuple[int, int], int]:
+        """Cells of windows open to player_id that lack at most max_missing stones.
+
+        Only windows holding a stone or a pending cell are considered. A window
+        with neither is left out even when the pattern fits max_missing: for a
+        pattern that small every empty cell would qualify, which says nothing
+        and has no bound on the sparse board.
+        """
+        self.enable_near_cells()
+        cells: Dict[Tuple[int, int], int] = {}
+        levels = self.near_cells.get(player_id)
+        if levels is not None:
+            for missing in range(min(max_missing, self.near_limit), 0, -1):
+                for cell in levels[missing]:
+                    cells[cell] = missing
+        hits: Dict[Tuple[int, int, int], int] = {}
+        for x, y in pending:
+            for key in self.iter_windows_at(x, y):
+                hits[key] = hits.get(key, 0) + 1
+        for key, count in hits.items():
+            owners = self.stones.get(key, {})
+            if len(owners) > 1 or (owners and player_id not in owners):
+                continue
+            missing = self.get_window_size(key) - owners.get(player_id, 0) - count
+            if missing > max_missing:
+                continue
+            for cell in self.get_window_cells(key):
+                if missing < cells.get(cell, max_missing + 1):
+                    cells[cell] = missing
+        return cells
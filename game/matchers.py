@@ -0,0 +1,302 @@
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from game.board import (
+    DEFAULT_WIN_PATTERNS,
+    MAX_BOARD_SIZE,
+    MIN_BOARD_SIZE,
+    CompiledPatternSet,
+    create_board,
+)
+
+Shape = Tuple[Tuple[int, int], ...]
+
+MATCHER_CELLS = {
+    "grid": "cells[{y}][{x}]",
+    "sparse": "cells.get(({x}, {y}))",
+}
+
+BENCHMARK_SHAPES = {
+    "L": [(0, 0), (0, 1), (0, 2), (1, 0), (2, 0)],
+    "крест": [(1, 0), (0, 1), (1, 1), (2, 1), (1, 2)],
+    "T": [(0, 0), (1, 0), (2, 0), (1, 1), (1, 2)],
+    "линия с пропуском": [(0, 0), (1, 0), (3, 0), (4, 0)],
+    "квадрат": [(0, 0), (1, 0), (0, 1), (1, 1)],
+    "зигзаг": [(0, 0), (1, 0), (1, 1), (2, 1), (2, 2)],
+}
+
+_multi_matcher_cache: Dict[Tuple[Tuple[Shape, ...], str], Optional["MultiPatternMatcher"]] = {}
+
+
+def _offset(name: str, delta: int) -> str:
+    if delta > 0:
+        return f"{name} + {delta}"
+    if delta < 0:
+        return f"{name} - {-delta}"
+    return name
+
+
+class MatchNode:
+    __slots__ = ("children", "candidate")
+
+    def __init__(self):
+        self.children: Dict[Tuple[int, int], "MatchNode"] = {}
+        self.candidate: Optional[int] = None
+
+
+def _bounds_check(dx: int, dy: int) -> List[str]:
+    checks = []
+    if dx < 0:
+        checks.append(f"x >= {-dx}")
+    elif dx > 0:
+        checks.append(f"x < width - {dx}")
+    if dy < 0:
+        checks.append(f"y >= {-dy}")
+    elif dy > 0:
+        checks.append(f"y < height - {dy}")
+    return checks
+
+
+class MultiPatternMatcher:
+    def __init__(self, patterns: CompiledPatternSet, kind: str = "grid"):
+        self.kind = kind
+        self.candidates: List[Tuple[int, Shape]] = []
+        for pattern_index, pattern in enumerate(patterns):
+            for anchors in pattern.anchors:
+                for _, _, offsets in anchors:
+                    self.candidates.append((pattern_index, offsets))
+
+        frequency: Dict[Tuple[int, int], int] = {}
+        for _, offsets in self.candidates:
+            for offset in offsets:
+                frequency[offset] = frequency.get(offset, 0) + 1
+        order = {
+            offset: rank
+            for rank, offset in enumerate(sorted(frequency, key=lambda o: (-frequency[o], o[1], o[0])))
+        }
+        self.root = MatchNode()
+        for candidate, (_, offsets) in enumerate(self.candidates):
+            node = self.root
+            for offset in sorted(offsets, key=order.__getitem__):
+                if offset == (0, 0):
+                    continue
+                child = node.children.get(offset)
+                if child is None:
+                    child = node.children[offset] = MatchNode()
+                node = child
+            if node.candidate is None:
+                node.candidate = candidate
+        self.source = self.generate_source()
+        namespace: dict = {}
+        exec(compile(self.source, f"<multi matcher {kind} {patterns.fingerprint:016x}>", "exec"), namespace)
+        self.find = namespace["find"]
+
+    def generate_source(self) -> str:
+        cell = MATCHER_CELLS[self.kind]
+        lines = [
+            "def find(cells, x, y, player_id, width, height):",
+            f"    if {cell.format(x='x', y='y')} != player_id:",
+            "        return None",
+            "    found = []",
+        ]
+
+        def emit(node: MatchNode, depth: int):
+            indent = "    " * depth
+            if node.candidate is not None:
+                lines.append(f"{indent}found.append({node.candidate})")
+            for offset, child in node.children.items():
+                condition = []
+                while True:
+                    dx, dy = offset
+                    condition += _bounds_check(dx, dy)
+                    condition.append(f"{cell.format(x=_offset('x', dx), y=_offset('y', dy))} == player_id")
+                    if child.candidate is not None or len(child.children) != 1:
+                        break
+                    (offset, child), = child.children.items()
+                lines.append(f"{indent}if {' and '.join(condition)}:")
+                emit(child, depth + 1)
+
+        emit(self.root, 1)
+        lines.append("    return found")
+        return "\n".join(lines) + "\n"
+
+    def match(self, cells, x: int, y: int, player_id: int, width: int, height: int) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        found = self.find(cells, x, y, player_id, width, height)
+        if not found:
+            return None
+        pattern_index, offsets = self.candidates[min(found)]
+        return pattern_index, [(x + dx, y + dy) for dx, dy in offsets]
+
+
+def get_multi_matcher(patterns: CompiledPatternSet, kind: str = "grid") -> Optional[MultiPatternMatcher]:
+    key = (tuple(pattern.cells for pattern in patterns), kind)
+    if key not in _multi_matcher_cache:
+        try:
+            _multi_matcher_cache[key] = MultiPatternMatcher(patterns, kind)
+        except (SyntaxError, RecursionError):
+            _multi_matcher_cache[key] = None
+    return _multi_matcher_cache[key]
+
+
+def clear_matcher_caches():
+    _multi_matcher_cache.clear()
+
+
+def random_shape(rng: random.Random, size: int) -> List[Tuple[int, int]]:
+    cells = [(0, 0)]
+    while len(cells) < size:
+        x, y = rng.choice(cells)
+        cell = (x + rng.choice((-1, 0, 1)), y + rng.choice((-1, 0, 1)))
+        if cell not in cells:
+            cells.append(cell)
+    return cells
+
+
+def random_library(rng: random.Random, count: int, min_size: int = 4, max_size: int = 6) -> List[dict]:
+    seen = set()
+    library = []
+    while len(library) < count:
+        cells = random_shape(rng, rng.randint(min_size, max_size))
+        shape = CompiledPatternSet([{"cells": cells}]).patterns[0].shape
+        if shape not in seen:
+            seen.add(shape)
+            library.append({"enabled": True, "cells": cells})
+    return library
+
+
+def fill_board(board, density: float, rng: random.Random, player_count: int):
+    for y in range(board.height):
+        for x in range(board.width):
+            if rng.random() < density:
+                board.place_figure(x, y, rng.randrange(player_count))
+
+
+def run_benchmark(
+    shapes: Dict[str, List[Tuple[int, int]]],
+    size: int,
+    density: float,
+    players: int,
+    rounds: int,
+    seed: int,
+) -> List[dict]:
+    rng = random.Random(seed)
+    results = []
+    for kind, backend in (("grid", "grid"), ("sparse", "sparse")):
+        board = create_board(size, size, backend, players)
+        fill_board(board, density, rng, players)
+        stones = list(board.iter_stones())
+        for name, shape in shapes.items():
+            patterns = CompiledPatternSet([{"cells": shape}])
+            timings = {}
+            expected = None
+            for mode in (None, kind):
+                board.matcher_kind = mode
+                found = [board.check_win_at(x, y, player_id, patterns) for x, y, player_id in stones]
+                if expected is None:
+                    expected = found
+                elif found != expected:
+                    raise AssertionError(f"Дерево расходится с общей проверкой: {name}, {kind}")
+                started = time.perf_counter()
+                for _ in range(rounds):
+                    for x, y, player_id in stones:
+                        board.check_win_at(x, y, player_id, patterns)
+                timings[mode] = time.perf_counter() - started
+            del board.matcher_kind
+
+            checks = rounds * len(stones)
+            generic, tree = timings[None], timings[kind]
+            results.append({
+                "shape": name,
+                "kind": kind,
+                "checks": checks,
+                "wins": sum(1 for cells_found in expected if cells_found),
+                "generic_us": generic / checks * 1e6 if checks else 0.0,
+                "tree_us": tree / checks * 1e6 if checks else 0.0,
+                "speedup": generic / tree if tree else 0.0,
+            })
+    return results
+
+
+def run_library_benchmark(
+    library_sizes: List[int],
+    size: int,
+    density: float,
+    players: int,
+    rounds: int,
+    seed: int,
+) -> List[dict]:
+    rng = random.Random(seed)
+    library = random_library(rng, max(library_sizes))
+    board = create_board(size, size, "grid", players)
+    fill_board(board, density, rng, players)
+    stones = list(board.iter_stones())
+    modes = (("общий", None), ("дерево", "grid"))
+    results = []
+    for count in library_sizes:
+        patterns = CompiledPatternSet(library[:count])
+        started = time.perf_counter()
+        patterns.get_multi_matcher("grid")
+        build = time.perf_counter() - started
+        timings = {}
+        expected = None
+        for name, kind in modes:
+            board.matcher_kind = kind
+            found = [board.check_win_at(x, y, player_id, patterns) for x, y, player_id in stones]
+            if expected is None:
+                expected = found
+            elif found != expected:
+                raise AssertionError(f"Проверка «{name}» расходится с общей: {count} фигур")
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for x, y, player_id in stones:
+                    board.check_win_at(x, y, player_id, patterns)
+            timings[name] = (time.perf_counter() - started) / (rounds * len(stones)) * 1e6 if stones else 0.0
+        results.append({
+            "patterns": count,
+            "wins": sum(1 for cells_found in expected if cells_found),
+            "build_ms": build * 1e3,
+            "timings": timings,
+        })
+    del board.matcher_kind
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Сравнение дерева проверок с общей проверкой фигур")
+    parser.add_argument("--size", type=int, default=30, help="Размер поля")
+    parser.add_argument("--density", type=float, default=0.3, help="Доля занятых клеток")
+    parser.add_argument("--players", type=int, default=2, help="Количество игроков")
+    parser.add_argument("--rounds", type=int, default=20, help="Проходов по всем камням")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument("--library", default=None, help="Размеры случайных наборов фигур через запятую, например 10,50,200")
+    args = parser.parse_args(argv)
+
+    size = max(MIN_BOARD_SIZE, min(MAX_BOARD_SIZE, args.size))
+    if args.library:
+        library_sizes = [max(1, int(value)) for value in args.library.split(",") if value.strip()]
+        results = run_library_benchmark(library_sizes, size, args.density, max(1, args.players), max(1, args.rounds), args.seed)
+        for result in results:
+            timings = ", ".join(f"{name} {value:.1f} мкс" for name, value in result["timings"].items())
+            print(
+                f"фигур {result['patterns']:4}, побед {result['wins']:5}, "
+                f"построение дерева {result['build_ms']:.0f} мс: {timings}"
+            )
+        return
+
+    shapes = dict(BENCHMARK_SHAPES)
+    for i, pattern in enumerate(DEFAULT_WIN_PATTERNS):
+        shapes[f"стандарт {i + 1}"] = pattern["cells"]
+    results = run_benchmark(shapes, size, args.density, max(1, args.players), max(1, args.rounds), args.seed)
+    for result in results:
+        print(
+            f"{result['kind']:6} {result['shape']:18} проверок {result['checks']:7}, побед {result['wins']:5}: "
+            f"общий {result['generic_us']:.2f} мкс, дерево {result['tree_us']:.2f} мкс, "
+            f"x{result['speedup']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
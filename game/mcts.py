@@ -0,0 +1,257 @@
+import math
+import multiprocessing
+import multiprocessing.util
+import os
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+from game.alphabeta import AlphaBetaBot
+from game.rules import GameRules
+
+Turn = Tuple[Tuple[int, int], ...]
+
+
+class MCTSNode:
+    __slots__ = ("turn", "parent", "player_index", "children", "untried", "visits", "reward")
+
+    def __init__(self, turn: Optional[Turn], parent: Optional["MCTSNode"], player_index: Optional[int]):
+        self.turn = turn
+        self.parent = parent
+        self.player_index = player_index
+        self.children: List["MCTSNode"] = []
+        self.untried: Optional[List[Turn]] = None
+        self.visits = 0
+        self.reward = 0.0
+
+    def select_child(self, exploration: float) -> "MCTSNode":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.reward / child.visits + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+
+class MCTSBot(AlphaBetaBot):
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        time_budget: float = 1.0,
+        playouts: int = 20000,
+        workers: Optional[int] = None,
+        exploration: float = 1.0,
+        playout_turns: int = 12,
+        cell_limit: int = 6,
+        turn_limit: int = 8,
+        near_radius: int = 2,
+        use_book: bool = True,
+    ):
+        super().__init__(
+            seed=seed,
+            time_budget=time_budget,
+            cell_limit=cell_limit,
+            turn_limit=turn_limit,
+            table_size_mb=0,
+            use_book=use_book,
+        )
+        self.playouts = playouts
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.exploration = exploration
+        self.playout_turns = playout_turns
+        self.near_radius = near_radius
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.cancelled = None
+        self.token = 0
+        self.shutdown_executor = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.cancelled = multiprocessing.Value("q", 0)
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_search_worker,
+                initargs=(self.cancelled,),
+            )
+            self.shutdown_executor = multiprocessing.util.Finalize(
+                self, self.executor.shutdown, kwargs={"cancel_futures": True}, exitpriority=100
+            )
+        return self.executor
+
+    def close(self):
+        if self.executor is not None:
+            self.shutdown_executor()
+            self.shutdown_executor = None
+            self.executor = None
+
+    def get_options(self) -> dict:
+        return {
+            "exploration": self.exploration,
+            "playout_turns": self.playout_turns,
+            "cell_limit": self.cell_limit,
+            "turn_limit": self.turn_limit,
+            "near_radius": self.near_radius,
+        }
+
+    def choose_turn(self, rules: GameRules, should_stop: Optional[Callable[[], bool]] = None) -> List[Tuple[int, int]]:
+        started = time.perf_counter()
+        book_turn = self.get_book_turn(rules)
+        if book_turn is not None:
+            self.last_stats = {"playouts": 0, "elapsed": time.perf_counter() - started, "playouts_per_second": 0.0, "book": True}
+            return book_turn
+        turns = [tuple(turn) for turn in self.generate_turns(rules)]
+        totals: Dict[Turn, List[float]] = {turn: [0, 0.0] for turn in turns}
+        playouts = 0
+        if len(turns) > 1:
+            workers = max(1, min(self.workers, self.playouts))
+            seeds = [self.rng.getrandbits(32) for _ in range(workers)]
+            deadline = time.time() + self.time_budget - (time.perf_counter() - started)
+            if workers == 1:
+                results = [run_search(rules, turns, seeds[0], self.playouts, deadline, self.get_options(), should_stop)]
+            else:
+                executor = self.get_executor()
+                self.token += 1
+                share = -(-self.playouts // workers)
+                futures = [
+                    executor.submit(run_search, rules, turns, seed, share, deadline, self.get_options(), token=self.token)
+                    for seed in seeds
+                ]
+                pending = futures
+                while pending:
+                    if should_stop and should_stop():
+                        self.cancelled.value = self.token
+                        for future in pending:
+                            future.cancel()
+                        break
+                    _, pending = wait(pending, timeout=0.05, return_when=FIRST_EXCEPTION)
+                results = [future.result() for future in futures if future.done() and not future.cancelled()]
+            for children, count in results:
+                playouts += count
+                for turn, visits, reward in children:
+                    totals[turn][0] += visits
+                    totals[turn][1] += reward
+        best_turn = max(turns, key=lambda turn: (totals[turn][0], totals[turn][1])) if turns else ()
+        elapsed = time.perf_counter() - started
+        self.last_stats = {
+            "playouts": playouts,
+            "elapsed": elapsed,
+            "playouts_per_second": playouts / elapsed if elapsed > 0 else 0.0,
+        }
+        return list(best_turn)
+
+    def search(
+        self,
+        rules: GameRules,
+        turns: List[Turn],
+        playouts: int,
+        time_limit: float,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[MCTSNode, int]:
+        deadline = time.perf_counter() + time_limit
+        root = MCTSNode(None, None, None)
+        root.untried = list(turns)
+        done = 0
+        while done < playouts and time.perf_counter() < deadline:
+            if should_stop and should_stop():
+                break
+            node = root
+            depth = 0
+            try:
+                while not node.untried and node.children:
+                    node = node.select_child(self.exploration)
+                    rules.apply_turn(list(node.turn))
+                    depth += 1
+                if not rules.game_over:
+                    if node.untried is None:
+                        node.untried = [tuple(turn) for turn in self.generate_turns(rules)]
+                        self.rng.shuffle(node.untried)
+                    if node.untried:
+                        turn = node.untried.pop()
+                        child = MCTSNode(turn, node, rules.current_player_index)
+                        node.children.append(child)
+                        node = child
+                        rules.apply_turn(list(turn))
+                        depth += 1
+                rewards = self.playout(rules)
+            finally:
+                for _ in range(depth):
+                    rules.undo_turn()
+            while node is not None:
+                node.visits += 1
+                if node.player_index is not None:
+                    node.reward += rewards[node.player_index]
+                node = node.parent
+            done += 1
+        return root, done
+
+    def playout(self, rules: GameRules) -> List[float]:
+        stones = [(x, y) for x, y, _ in rules.board.iter_stones()]
+        applied = 0
+        try:
+            while not rules.game_over and applied < self.playout_turns:
+                moves = self.playout_turn(rules, stones)
+                success, _ = rules.apply_turn(moves)
+                if not success:
+                    break
+                stones.extend(moves)
+                applied += 1
+            return self.get_rewards(rules)
+        finally:
+            for _ in range(applied):
+                rules.undo_turn()
+
+    def playout_turn(self, rules: GameRules, stones: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        winning = self.find_winning_turn(rules, rules.get_current_player().player_id)
+        if winning is not None:
+            return winning
+        board = rules.board
+        radius = self.near_radius
+        moves = []
+        for _ in range(rules.MAX_MOVES_PER_TURN * 8):
+            if len(moves) >= rules.MAX_MOVES_PER_TURN:
+                break
+            if stones:
+                x, y = self.rng.choice(stones)
+                cell = (x + self.rng.randint(-radius, radius), y + self.rng.randint(-radius, radius))
+            else:
+                cell = (self.rng.randrange(board.width), self.rng.randrange(board.height))
+            if cell not in moves and board.is_empty(*cell):
+                moves.append(cell)
+        return moves
+
+    def get_rewards(self, rules: GameRules) -> List[float]:
+        rewards = [0.0] * len(rules.players)
+        if rules.winner is not None:
+            rewards[rules.players.index(rules.winner)] = 1.0
+            return rewards
+        active = [i for i in range(len(rules.players)) if rules.is_player_active(i)]
+        if not active:
+            return rewards
+        scores = [rules.live_windows.get_threat_score(rules.players[i].player_id) for i in active]
+        total = sum(scores)
+        for i, score in zip(active, scores):
+            rewards[i] = score / total if total else 1.0 / len(active)
+        return rewards
+
+
+_search_cancelled = None
+
+
+def init_search_worker(cancelled):
+    global _search_cancelled
+    _search_cancelled = cancelled
+
+
+def run_search(
+    rules: GameRules,
+    turns: List[Turn],
+    seed: int,
+    playouts: int,
+    deadline: float,
+    options: dict,
+    should_stop: Optional[Callable[[], bool]] = None,
+    token: int = 0,
+) -> Tuple[List[Tuple[Turn, int, float]], int]:
+    if should_stop is None and _search_cancelled is not None and token:
+        should_stop = lambda: _search_cancelled.value >= token
+    bot = MCTSBot(seed=seed, workers=1, **options)
+    root, done = bot.search(rules, turns, playouts, deadline - time.time(), should_stop)
+    return [(child.turn, child.visits, child.reward) for child in root.children], done
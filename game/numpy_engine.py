@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from game.board import Board, CompiledPattern, CompiledPatternSet
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+NUMPY_AVAILABLE = np is not None
+EMPTY_CELL = -1
+
+
+def get_match_planes(cells, player_id: int, transformed: Tuple[Tuple[int, int], ...]):
+    height, width = cells.shape[-2:]
+    size_x = max(px for px, _ in transformed) + 1
+    size_y = max(py for _, py in transformed) + 1
+    if size_x > width or size_y > height:
+        return None
+    own = cells == player_id
+    rows = height - size_y + 1
+    cols = width - size_x + 1
+    match = None
+    for px, py in transformed:
+        plane = own[..., py:py + rows, px:px + cols]
+        match = plane.copy() if match is None else np.logical_and(match, plane, out=match)
+    return match
+
+
+def check_positions(positions, player_id: int, patterns: Union[List[dict], CompiledPatternSet] = None) -> List[bool]:
+    if not isinstance(patterns, CompiledPatternSet):
+        patterns = CompiledPatternSet.from_patterns(patterns)
+    if np is None:
+        return [_check_position_fallback(position, player_id, patterns) for position in positions]
+
+    cells = np.asarray(positions, dtype=np.int8)
+    found = np.zeros(cells.shape[0], dtype=bool)
+    for pattern in patterns:
+        for transformed in pattern.transformations:
+            match = get_match_planes(cells, player_id, transformed)
+            if match is not None:
+                found |= match.any(axis=(1, 2))
+    return found.tolist()
+
+
+def _check_position_fallback(position: Sequence[Sequence[int]], player_id: int, patterns: CompiledPatternSet) -> bool:
+    height = len(position)
+    width = len(position[0]) if height else 0
+    for pattern in patterns:
+        for transformed, (size_x, size_y) in zip(pattern.transformations, pattern.sizes):
+            for base_y in range(height - size_y + 1):
+                for base_x in range(width - size_x + 1):
+                    if all(position[base_y + py][base_x + px] == player_id for px, py in transformed):
+                        return True
+    return False
+
+
+class NumpyBoard(Board):
+    matcher_kind = None
+
+    def _clear_cells(self):
+        self.cells = np.full((self.height, self.width), EMPTY_CELL, dtype=np.int8)
+        self._match_cache: Dict[Tuple[int, Tuple[Tuple[int, int], ...]], object] = {}
+
+    def is_empty(self, x: int, y: int) -> bool:
+        if not self.is_valid_position(x, y):
+            return False
+        return bool(self.cells[y, x] == EMPTY_CELL)
+
+    def get_cell(self, x: int, y: int) -> Optional[int]:
+        if not self.is_valid_position(x, y):
+            return None
+        value = int(self.cells[y, x])
+        return None if value == EMPTY_CELL else value
+
+    def _set_cell(self, x: int, y: int, player_id: Optional[int]):
+        self.cells[y, x] = EMPTY_CELL if player_id is None else player_id
+        self._match_cache.clear()
+
+    def count_in_direction(self, x: int, y: int, dx: int, dy: int, player_id: int) -> int:
+        count = 0
+        cx, cy = x + dx, y + dy
+        while self.is_valid_position(cx, cy) and self.cells[cy, cx] == player_id:
+            count += 1
+            cx += dx
+            cy += dy
+        return count
+
+    def get_match_plane(self, player_id: int, transformed: Tuple[Tuple[int, int], ...]):
+        key = (player_id, transformed)
+        if key not in self._match_cache:
+            self._match_cache[key] = get_match_planes(self.cells, player_id, transformed)
+        return self._match_cache[key]
+
+    def _check_transformations_at(self, x: int, y: int, player_id: int, pattern: CompiledPattern) -> Optional[List[Tuple[int, int]]]:
+        for transformed in pattern.transformations:
+            match = self.get_match_plane(player_id, transformed)
+            if match is None:
+                continue
+            rows, cols = match.shape
+            for offset_x, offset_y in transformed:
+                base_x = x - offset_x
+                base_y = y - offset_y
+                if 0 <= base_x < cols and 0 <= base_y < rows and match[base_y, base_x]:
+                    return [(base_x + px, base_y + py) for px, py in transformed]
+        return None
@@ -0,0 +1,217 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from game.alphabeta import AlphaBetaBot
+from game.board import BOARD_BACKENDS, MAX_BOARD_SIZE, MIN_BOARD_SIZE, SYMMETRY_INVERSES, apply_symmetry, create_board
+from game.player import AVAILABLE_COLORS, AVAILABLE_FIGURES, MAX_PLAYERS, Player
+from game.player_db import get_db_path
+from game.rules import GameRules
+from game.transposition import get_state_key, pack_turn, unpack_turn
+
+BOOK_MAGIC = b"TTTBOOK1"
+BOOK_VERSION = 1
+HEADER = struct.Struct("<8sHHHHBxQQ")
+RECORD = struct.Struct("<QQ")
+BOOKS_DIR = Path(__file__).resolve().parent.parent / "assets" / "books"
+
+
+def get_book_filename(width: int, height: int, player_count: int, fingerprint: int) -> str:
+    return f"book_{width}x{height}_{player_count}p_{fingerprint:016x}.bin"
+
+
+def get_book_dirs() -> List[str]:
+    return [str(BOOKS_DIR), os.path.dirname(get_db_path())]
+
+
+def get_book_key(rules: GameRules) -> Tuple[int, int]:
+    board_hash, symmetry = rules.board.get_canonical_hash()
+    return board_hash ^ get_state_key(rules.current_player_index, rules.eliminated), symmetry
+
+
+class OpeningBook:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"Пустой файл книги: {path}")
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise ValueError(f"Повреждённая книга: {path}")
+        (
+            magic,
+            version,
+            self.width,
+            self.height,
+            self.player_count,
+            self.zobrist_scheme,
+            self.fingerprint,
+            self.count,
+        ) = HEADER.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION or len(self.data) < HEADER.size + self.count * RECORD.size:
+            self.close()
+            raise ValueError(f"Повреждённая книга: {path}")
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def matches(self, rules: GameRules) -> bool:
+        board = rules.board
+        return (
+            self.width == board.width
+            and self.height == board.height
+            and self.player_count == board.player_count
+            and self.zobrist_scheme == board.zobrist_scheme
+            and self.fingerprint == rules.compiled_patterns.fingerprint
+        )
+
+    def lookup(self, key: int) -> int:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, packed = RECORD.unpack_from(self.data, HEADER.size + middle * RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return packed
+        return 0
+
+    def get_turn(self, rules: GameRules) -> Optional[List[Tuple[int, int]]]:
+        board = rules.board
+        board.enable_symmetry_hashes()
+        key, symmetry = get_book_key(rules)
+        packed = self.lookup(key)
+        if not packed:
+            return None
+        inverse = board.symmetries[SYMMETRY_INVERSES[symmetry]]
+        cells = [apply_symmetry(inverse, x, y) for x, y in unpack_turn(packed, board.width)]
+        if len(set(cells)) != len(cells) or not all(board.is_empty(x, y) for x, y in cells):
+            return None
+        return cells
+
+
+def open_book(rules: GameRules) -> Optional[OpeningBook]:
+    board = rules.board
+    filename = get_book_filename(board.width, board.height, board.player_count, rules.compiled_patterns.fingerprint)
+    for directory in get_book_dirs():
+        path = os.path.join(directory, filename)
+        if not os.path.isfile(path):
+            continue
+        try:
+            book = OpeningBook(path)
+        except (OSError, ValueError):
+            continue
+        if book.matches(rules):
+            return book
+        book.close()
+    return None
+
+
+def write_book(path: str, rules: GameRules, entries: Dict[int, int]):
+    board = rules.board
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(
+                BOOK_MAGIC,
+                BOOK_VERSION,
+                board.width,
+                board.height,
+                board.player_count,
+                board.zobrist_scheme,
+                rules.compiled_patterns.fingerprint,
+                len(entries),
+            ))
+            for key in sorted(entries):
+                f.write(RECORD.pack(key, entries[key]))
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def build_book(rules: GameRules, bot: AlphaBetaBot, plies: int, branching: int) -> Dict[int, int]:
+    board = rules.board
+    board.enable_symmetry_hashes()
+    entries: Dict[int, int] = {}
+    started = time.perf_counter()
+
+    def visit(ply: int):
+        if rules.game_over:
+            return
+        key, symmetry = get_book_key(rules)
+        if key in entries:
+            return
+        turn = bot.choose_turn(rules)
+        transform = board.symmetries[symmetry]
+        entries[key] = pack_turn([apply_symmetry(transform, x, y) for x, y in turn], board.width, board.height)
+        print(f"  позиций: {len(entries)}, ход {ply + 1}, {time.perf_counter() - started:.1f} с", flush=True)
+        if ply + 1 >= plies:
+            return
+        replies = [turn]
+        for candidate in bot.generate_turns(rules):
+            if len(replies) >= branching:
+                break
+            if sorted(candidate) != sorted(turn):
+                replies.append(candidate)
+        for reply in replies:
+            rules.apply_turn(reply)
+            try:
+                visit(ply + 1)
+            finally:
+                rules.undo_turn()
+
+    visit(0)
+    return entries
+
+
+def main(argv: Optional[List[str]] = None):
+    from game.simulate import load_patterns
+
+    parser = argparse.ArgumentParser(description="Построение дебютной книги для ботов")
+    parser.add_argument("--width", type=int, default=20, help="Ширина поля")
+    parser.add_argument("--height", type=int, default=20, help="Высота поля")
+    parser.add_argument("--players", type=int, default=2, choices=range(1, MAX_PLAYERS + 1), help="Количество игроков")
+    parser.add_argument("--patterns", default=None, help="JSON-файл с фигурами (список или настройки с win_patterns)")
+    parser.add_argument("--board", default="grid", choices=BOARD_BACKENDS, help="Хранение доски")
+    parser.add_argument("--plies", type=int, default=3, help="Глубина книги в ходах")
+    parser.add_argument("--branching", type=int, default=3, help="Сколько ответов раскрывать в каждой позиции")
+    parser.add_argument("--time", type=float, default=2.0, help="Время поиска на позицию, с")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument("--output", default=None, help="Файл книги (по умолчанию в папке данных)")
+    args = parser.parse_args(argv)
+
+    width = max(MIN_BOARD_SIZE, min(MAX_BOARD_SIZE, args.width))
+    height = max(MIN_BOARD_SIZE, min(MAX_BOARD_SIZE, args.height))
+    board = create_board(width, height, args.board, args.players)
+    players = [
+        Player(player_id=i, name=f"Игрок {i + 1}", figure=AVAILABLE_FIGURES[i], color=AVAILABLE_COLORS[i])
+        for i in range(args.players)
+    ]
+    rules = GameRules(board, players, load_patterns(args.patterns))
+    bot = AlphaBetaBot(seed=args.seed, time_budget=args.time, use_book=False)
+
+    output = args.output or os.path.join(
+        os.path.dirname(get_db_path()),
+        get_book_filename(width, height, args.players, rules.compiled_patterns.fingerprint),
+    )
+    started = time.perf_counter()
+    entries = build_book(rules, bot, args.plies, args.branching)
+    write_book(output, rules, entries)
+    print(f"Книга: {len(entries)} позиций за {time.perf_counter() - started:.1f} с -> {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
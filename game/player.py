@@ -42,4 +42,12 @@ COLOR_NAMES = {
     (200, 200, 200): "Серый",
 }
 
+AVAILABLE_CONTROLLERS = ["human", "alphabeta", "mcts"]
+
+CONTROLLER_NAMES = {
+    "human": "Человек",
+    "alphabeta": "ИИ",
+    "mcts": "ИИ MCTS",
+}
+
 MAX_PLAYERS = min(len(AVAILABLE_FIGURES), len(AVAILABLE_COLORS))
@@ -1,8 +1,23 @@
-from typing import List, Tuple, Optional
-from game.board import Board
+from dataclasses import dataclass
+from typing import FrozenSet, List, Set, Tuple, Optional
+from game.board import Board, CompiledPatternSet
+from game.live_windows import LiveWindowTracker
 from game.player import Player
 
 
+@dataclass
+class TurnRecord:
+    moves: List[Tuple[int, int]]
+    player_index: int
+    last_player_index: Optional[int]
+    unchecked_moves: List[Tuple[int, int]]
+    eliminated: FrozenSet[int]
+    winner: Optional[Player]
+    winning_cells: List[Tuple[int, int]]
+    is_draw: bool
+    game_over: bool
+
+
 class GameRules:
     WIN_LENGTH = 5
     MAX_MOVES_PER_TURN = 3
@@ -19,12 +34,51 @@ class GameRules:
         self.game_over = False
         self.last_player_index: Optional[int] = None
         self.eliminated: set[int] = set()
+        self.compiled_patterns = CompiledPatternSet(win_patterns)
+        self.win_reach = self.compiled_patterns.extent
+        self.board.set_frontier_radius(max(1, self.win_reach - 1))
+        self.unchecked_moves: List[List[Tuple[int, int]]] = [[] for _ in players]
+        self.live_windows = LiveWindowTracker(board.width, board.height, self.compiled_patterns, self.MAX_MOVES_PER_TURN + 1)
+        self.history: List[TurnRecord] = []
+        self.collect_board_state()
+
+    def collect_board_state(self):
+        index_by_id = {player.player_id: i for i, player in enumerate(self.players)}
+        for moves in self.unchecked_moves:
+            moves.clear()
+        self.live_windows.reset()
+        for x, y, player_id in self.board.iter_stones():
+            self.live_windows.add_stone(x, y, player_id)
+            index = index_by_id.get(player_id)
+            if index is not None:
+                self.unchecked_moves[index].append((x, y))
     
     def get_current_player(self) -> Player:
         return self.players[self.current_player_index]
     
     def get_remaining_moves(self) -> int:
         return self.MAX_MOVES_PER_TURN - len(self.pending_moves)
+
+    def get_hint_cells(self) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        winning: Set[Tuple[int, int]] = set()
+        near: Set[Tuple[int, int]] = set()
+        threats: Set[Tuple[int, int]] = set()
+        if self.game_over:
+            return winning, near, threats
+        board = self.board
+        pending = set(self.pending_moves)
+        remaining = self.get_remaining_moves()
+        current = self.get_current_player().player_id
+        for cell, missing in self.live_windows.get_near_cells(current, remaining + 1, pending).items():
+            if cell not in pending and board.is_empty(*cell):
+                (winning if missing <= remaining else near).add(cell)
+        for i, player in enumerate(self.players):
+            if i == self.current_player_index or not self.is_player_active(i):
+                continue
+            for cell in self.live_windows.get_near_cells(player.player_id, self.MAX_MOVES_PER_TURN):
+                if cell not in pending and board.is_empty(*cell):
+                    threats.add(cell)
+        return winning, near, threats
     
     def is_player_active(self, index: int) -> bool:
         return index not in self.eliminated
@@ -38,6 +92,22 @@ class GameRules:
             self.is_draw = True
             self.game_over = True
             self.winner = None
+        else:
+            self.check_dead_position()
+        return True
+
+    def is_dead_position(self) -> bool:
+        for i, player in enumerate(self.players):
+            if i not in self.eliminated and self.live_windows.get_live_count(player.player_id) > 0:
+                return False
+        return True
+
+    def check_dead_position(self) -> bool:
+        if self.game_over or not self.is_dead_position():
+            return False
+        self.is_draw = True
+        self.game_over = True
+        self.winner = None
         return True
 
     def add_pending_move(self, x: int, y: int) -> Tuple[bool, str]:
@@ -72,18 +142,78 @@ class GameRules:
         if self.game_over:
             return False, "Игра окончена"
         
-        current_player = self.get_current_player()
-        
         unique_moves = list(dict.fromkeys(self.pending_moves))
         valid_moves = [(x, y) for x, y in unique_moves if self.board.is_empty(x, y)]
-
-        for x, y in valid_moves:
-            self.board.place_figure(x, y, current_player.player_id)
+        self.place_moves(valid_moves, self.current_player_index)
 
         self.pending_moves.clear()
         self.last_player_index = self.current_player_index
+        self.check_dead_position()
         return True, "OK"
 
+    def place_moves(self, moves: List[Tuple[int, int]], player_index: int) -> List[Tuple[int, int]]:
+        player_id = self.players[player_index].player_id
+        placed = []
+        for x, y in moves:
+            if self.board.place_figure(x, y, player_id):
+                self.unchecked_moves[player_index].append((x, y))
+                self.live_windows.add_stone(x, y, player_id)
+                placed.append((x, y))
+        return placed
+
+    def apply_turn(self, moves: List[Tuple[int, int]]) -> Tuple[bool, str]:
+        if self.game_over:
+            return False, "Игра окончена"
+        if len(moves) > self.MAX_MOVES_PER_TURN:
+            return False, "Достигнут лимит ходов"
+        if len(set(moves)) != len(moves):
+            return False, "Эта клетка уже выбрана"
+        for x, y in moves:
+            if not self.board.is_valid_position(x, y):
+                return False, "Некорректные координаты"
+            if not self.board.is_empty(x, y):
+                return False, "Ячейка занята"
+
+        player_index = self.current_player_index
+        record = TurnRecord(
+            moves=list(moves),
+            player_index=player_index,
+            last_player_index=self.last_player_index,
+            unchecked_moves=self.unchecked_moves[player_index],
+            eliminated=frozenset(self.eliminated),
+            winner=self.winner,
+            winning_cells=self.winning_cells,
+            is_draw=self.is_draw,
+            game_over=self.game_over,
+        )
+        self.unchecked_moves[player_index] = list(record.unchecked_moves)
+        self.place_moves(record.moves, player_index)
+        self.last_player_index = player_index
+        self.history.append(record)
+
+        won, _ = self.check_winner()
+        if not won and not self.check_dead_position():
+            self.advance_turn()
+        return True, "OK"
+
+    def undo_turn(self) -> bool:
+        if not self.history:
+            return False
+        record = self.history.pop()
+        player_id = self.players[record.player_index].player_id
+        for x, y in reversed(record.moves):
+            self.board.remove_figure(x, y)
+            self.live_windows.remove_stone(x, y, player_id)
+        self.unchecked_moves[record.player_index] = record.unchecked_moves
+        self.current_player_index = record.player_index
+        self.last_player_index = record.last_player_index
+        self.eliminated = set(record.eliminated)
+        self.winner = record.winner
+        self.winning_cells = record.winning_cells
+        self.is_draw = record.is_draw
+        self.game_over = record.game_over
+        return True
+
     def advance_turn(self) -> Tuple[bool, str]:
         if self.game_over:
             return False, "Игра окончена"
@@ -103,17 +233,32 @@ class GameRules:
         if self.last_player_index is None:
             return False, "OK"
         player = self.players[self.last_player_index]
-        for y in range(self.board.height):
-            for x in range(self.board.width):
-                if self.board.get_cell(x, y) == player.player_id:
-                    win_cells = self.board.check_win_at(x, y, player.player_id, self.win_patterns)
-                    if win_cells:
-                        self.winner = player
-                        self.winning_cells = win_cells
-                        self.game_over = True
-                        return True, "OK"
+        moves = self.unchecked_moves[self.last_player_index]
+        for x, y in self.get_win_candidates(moves, player.player_id):
+            win_cells = self.board.check_win_at(x, y, player.player_id, self.compiled_patterns)
+            if win_cells:
+                self.winner = player
+                self.winning_cells = win_cells
+                self.game_over = True
+                return True, "OK"
+        moves.clear()
         return False, "OK"
 
+    def get_win_candidates(self, moves: List[Tuple[int, int]], player_id: int) -> List[Tuple[int, int]]:
+        reach = self.win_reach - 1
+        if reach < 0:
+            return []
+        width = self.board.width
+        height = self.board.height
+        own = self.board.get_stones(player_id)
+        candidates = set()
+        for mx, my in moves:
+            for y in range(max(0, my - reach), min(height, my + reach + 1)):
+                for x in range(max(0, mx - reach), min(width, mx + reach + 1)):
+                    if (x, y) in own:
+                        candidates.add((x, y))
+        return sorted(candidates, key=lambda cell: (cell[1], cell[0]))
+
     def skip_turn(self) -> Tuple[bool, str]:
         if self.game_over:
             return False, "Игра окончена"
@@ -132,6 +277,10 @@ class GameRules:
         self.game_over = False
         self.last_player_index = None
         self.eliminated.clear()
+        for moves in self.unchecked_moves:
+            moves.clear()
+        self.live_windows.reset()
+        self.history.clear()
     
     def parse_coordinate(self, coord_str: str) -> Optional[Tuple[int, int]]:
         coord_str = coord_str.strip().upper()
@@ -22,10 +22,12 @@ def get_default_settings():
         "height": 20,
         "player_count": 0,
         "hide_board_on_win": False,
+        "board_backend": "grid",
         "music_volume": 0.2,
+        "bot_time_budget": 1.0,
         "win_patterns": get_default_patterns(),
         "players": [
-            {"name": "", "figure": AVAILABLE_FIGURES[i], "color": AVAILABLE_COLORS[i]}
+            {"name": "", "figure": AVAILABLE_FIGURES[i], "color": AVAILABLE_COLORS[i], "controller": "human"}
             for i in range(MAX_PLAYERS)
         ]
     }
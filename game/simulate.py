@@ -0,0 +1,234 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from game.board import BOARD_BACKENDS, MIN_BOARD_SIZE, create_board, get_max_board_size
+from game.bots import BOTS, create_bot
+from game.player import AVAILABLE_COLORS, AVAILABLE_FIGURES, MAX_PLAYERS, Player
+from game.rules import GameRules
+from game.settings import get_default_patterns
+
+
+RESULT_FIELDS = [
+    "game",
+    "winner",
+    "winner_policy",
+    "draw",
+    "turn_limit",
+    "turns",
+    "eliminations",
+    "stones",
+    "duration",
+    "worker",
+]
+
+
+def has_unclaimed_win(rules: GameRules) -> bool:
+    player = rules.players[rules.last_player_index]
+    moves = rules.unchecked_moves[rules.last_player_index]
+    return any(
+        rules.board.check_win_at(x, y, player.player_id, rules.compiled_patterns)
+        for x, y in rules.get_win_candidates(moves, player.player_id)
+    )
+
+
+def play_game(config: dict, game_index: int) -> dict:
+    player_count = config["players"]
+    policies = config["policies"]
+    seed = config["seed"] * 1_000_003 + game_index
+    board = create_board(config["width"], config["height"], config["backend"], player_count)
+    players = [
+        Player(
+            player_id=i,
+            name=policies[i % len(policies)],
+            figure=AVAILABLE_FIGURES[i],
+            color=AVAILABLE_COLORS[i],
+        )
+        for i in range(player_count)
+    ]
+    bots = [
+        create_bot(policies[i % len(policies)], seed=seed * MAX_PLAYERS + i)
+        for i in range(player_count)
+    ]
+    rules = GameRules(board, players, config["patterns"])
+    rng = random.Random(seed)
+    claim_error = config.get("claim_error", 0.0)
+
+    started = time.perf_counter()
+    turns = 0
+    stones = 0
+    while not rules.game_over and turns < config["max_turns"]:
+        moves = bots[rules.current_player_index].choose_turn(rules)
+        rules.clear_pending_moves()
+        for x, y in moves:
+            rules.add_pending_move(x, y)
+        stones += len(rules.pending_moves)
+        rules.confirm_turn()
+        turns += 1
+        if rules.game_over:
+            break
+        claim = has_unclaimed_win(rules)
+        if claim_error and rng.random() < claim_error:
+            claim = not claim
+        if claim:
+            won, _ = rules.check_winner()
+            if won:
+                break
+            rules.eliminate_last_player()
+            if rules.game_over:
+                break
+        rules.advance_turn()
+    duration = time.perf_counter() - started
+    for bot in bots:
+        if hasattr(bot, "close"):
+            bot.close()
+
+    winner_index = rules.winner.player_id if rules.winner else None
+    return {
+        "game": game_index,
+        "winner": winner_index,
+        "winner_policy": players[winner_index].name if winner_index is not None else None,
+        "draw": rules.is_draw,
+        "turn_limit": not rules.game_over,
+        "turns": turns,
+        "eliminations": len(rules.eliminated),
+        "stones": stones,
+        "duration": round(duration, 6),
+        "worker": os.getpid(),
+    }
+
+
+def play_chunk(config: dict, game_indexes: List[int]) -> List[dict]:
+    return [play_game(config, game_index) for game_index in game_indexes]
+
+
+def split_chunks(games: int, chunk_size: int) -> List[List[int]]:
+    chunk_size = max(1, chunk_size)
+    return [list(range(start, min(games, start + chunk_size))) for start in range(0, games, chunk_size)]
+
+
+class ResultWriter:
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.file = None
+        self.csv_writer = None
+        if not path:
+            return
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        if path.lower().endswith(".csv"):
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, result: dict):
+        if self.file is None:
+            return
+        if self.csv_writer:
+            self.csv_writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+def load_patterns(path: Optional[str]) -> List[dict]:
+    if not path:
+        return get_default_patterns()
+    with open(path, encoding="utf-8") as f:
+        patterns = json.load(f)
+    if isinstance(patterns, dict):
+        patterns = patterns.get("win_patterns", [])
+    return patterns
+
+
+def run_simulation(config: dict, games: int, workers: int, chunk_size: int, output: Optional[str]) -> Dict[str, float]:
+    writer = ResultWriter(output)
+    chunks = split_chunks(games, chunk_size)
+    worker_games: Dict[int, int] = {}
+    worker_time: Dict[int, float] = {}
+    wins: Dict[str, int] = {}
+    draws = 0
+    started = time.perf_counter()
+    def record(results: List[dict]):
+        nonlocal draws
+        for result in results:
+            writer.write(result)
+            worker = result["worker"]
+            worker_games[worker] = worker_games.get(worker, 0) + 1
+            worker_time[worker] = worker_time.get(worker, 0.0) + result["duration"]
+            if result["winner_policy"] is not None:
+                wins[result["winner_policy"]] = wins.get(result["winner_policy"], 0) + 1
+            else:
+                draws += 1
+
+    try:
+        if workers <= 1:
+            for chunk in chunks:
+                record(play_chunk(config, chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(play_chunk, config, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    record(future.result())
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"Партий: {games} за {elapsed:.2f} с ({games / elapsed if elapsed else 0.0:.1f} партий/с)")
+    for worker in sorted(worker_games):
+        busy = worker_time[worker]
+        rate = worker_games[worker] / busy if busy else 0.0
+        print(f"  процесс {worker}: {worker_games[worker]} партий, {rate:.1f} партий/с")
+    for policy, count in sorted(wins.items()):
+        print(f"  побед {policy}: {count}")
+    print(f"  ничьих: {draws}")
+    return {"games": games, "elapsed": elapsed, "games_per_second": games / elapsed if elapsed else 0.0}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Пакетная симуляция партий без интерфейса")
+    parser.add_argument("--games", type=int, default=100, help="Количество партий")
+    parser.add_argument("--width", type=int, default=20, help="Ширина поля")
+    parser.add_argument("--height", type=int, default=20, help="Высота поля")
+    parser.add_argument("--players", type=int, default=2, choices=range(1, MAX_PLAYERS + 1), help="Количество игроков")
+    parser.add_argument("--policies", default="greedy,random", help=f"Боты через запятую ({', '.join(BOTS)})")
+    parser.add_argument("--patterns", default=None, help="JSON-файл с фигурами (список или настройки с win_patterns)")
+    parser.add_argument("--board", default="grid", choices=BOARD_BACKENDS, help="Хранение доски")
+    parser.add_argument("--max-turns", type=int, default=1000, help="Лимит ходов в партии")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Количество процессов")
+    parser.add_argument("--chunk-size", type=int, default=10, help="Партий в одной задаче")
+    parser.add_argument("--claim-error", type=float, default=0.0, help="Вероятность ошибиться с «Проверить»/«Далее» после хода")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument("--output", default=None, help="Файл результатов (.jsonl или .csv)")
+    args = parser.parse_args(argv)
+
+    policies = [name.strip() for name in args.policies.split(",") if name.strip()]
+    unknown = [name for name in policies if name not in BOTS]
+    if not policies or unknown:
+        parser.error(f"Неизвестные боты: {', '.join(unknown) or '-'}")
+
+    max_board_size = get_max_board_size(args.board)
+    config = {
+        "width": max(MIN_BOARD_SIZE, min(max_board_size, args.width)),
+        "height": max(MIN_BOARD_SIZE, min(max_board_size, args.height)),
+        "players": args.players,
+        "policies": policies,
+        "patterns": load_patterns(args.patterns),
+        "backend": args.board,
+        "max_turns": args.max_turns,
+        "claim_error": min(1.0, max(0.0, args.claim_error)),
+        "seed": args.seed,
+    }
+    run_simulation(config, args.games, args.workers, args.chunk_size, args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
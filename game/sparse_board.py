@@ -0,0 +1,78 @@
+from typing import Dict, List, Optional, Tuple
+from game.board import Board, CompiledPattern, SPARSE_MAX_BOARD_SIZE
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _mix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+class SparseBoard(Board):
+    max_size = SPARSE_MAX_BOARD_SIZE
+    zobrist_scheme = 1
+    matcher_kind = "sparse"
+
+    def _init_zobrist(self):
+        self._zobrist_seed = _mix64(self.width * 0x1F3D5B79 ^ self.height * 0x2545F491 ^ self.player_count)
+
+    def get_zobrist_key(self, x: int, y: int, player_id: int) -> int:
+        index = (y * self.width + x) * self.player_count + player_id
+        return _mix64(self._zobrist_seed ^ index)
+
+    def _clear_cells(self):
+        self.cells: Dict[Tuple[int, int], int] = {}
+
+    def is_empty(self, x: int, y: int) -> bool:
+        if not self.is_valid_position(x, y):
+            return False
+        return (x, y) not in self.cells
+
+    def get_cell(self, x: int, y: int) -> Optional[int]:
+        return self.cells.get((x, y))
+
+    def _set_cell(self, x: int, y: int, player_id: Optional[int]):
+        if player_id is None:
+            self.cells.pop((x, y), None)
+        else:
+            self.cells[(x, y)] = player_id
+
+    def _get_matcher_cells(self):
+        return self.cells
+
+    def count_in_direction(self, x: int, y: int, dx: int, dy: int, player_id: int) -> int:
+        cells = self.cells
+        count = 0
+        cx, cy = x + dx, y + dy
+        while cells.get((cx, cy)) == player_id:
+            count += 1
+            cx += dx
+            cy += dy
+        return count
+
+    def _check_transformations_at(self, x: int, y: int, player_id: int, pattern: CompiledPattern) -> Optional[List[Tuple[int, int]]]:
+        cells = self.cells
+        width = self.width
+        height = self.height
+
+        for (size_x, size_y), anchors in zip(pattern.sizes, pattern.anchors):
+            for offset_x, offset_y, offsets in anchors:
+                base_x = x - offset_x
+                base_y = y - offset_y
+
+                if base_x < 0 or base_y < 0 or base_x + size_x > width or base_y + size_y > height:
+                    continue
+
+                winning_cells = []
+                for dx, dy in offsets:
+                    cell = (x + dx, y + dy)
+                    if cells.get(cell) != player_id:
+                        break
+                    winning_cells.append(cell)
+                else:
+                    return winning_cells
+
+        return None
@@ -0,0 +1,123 @@
+import random
+from array import array
+from typing import Dict, List, Optional, Tuple
+from game.player import MAX_PLAYERS
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+ENTRY_BYTES = 8 + 8 + 8 + 1 + 1 + 1
+MOVE_BITS = 21
+MOVE_MASK = (1 << MOVE_BITS) - 1
+
+_state_rng = random.Random("transposition:state")
+TURN_KEYS = [_state_rng.getrandbits(64) for _ in range(MAX_PLAYERS)]
+ELIMINATED_KEYS = [_state_rng.getrandbits(64) for _ in range(MAX_PLAYERS)]
+ROOT_KEYS = [_state_rng.getrandbits(64) for _ in range(MAX_PLAYERS)]
+
+
+def get_state_key(current_index: int, eliminated, root_index: Optional[int] = None) -> int:
+    key = TURN_KEYS[current_index]
+    if root_index is not None:
+        key ^= ROOT_KEYS[root_index]
+    for index in eliminated:
+        key ^= ELIMINATED_KEYS[index]
+    return key
+
+
+def pack_turn(cells: List[Tuple[int, int]], width: int, height: int) -> int:
+    if width * height >= MOVE_MASK:
+        return 0
+    packed = 0
+    for x, y in cells:
+        packed = (packed << MOVE_BITS) | (y * width + x + 1)
+    return packed
+
+
+def unpack_turn(packed: int, width: int) -> List[Tuple[int, int]]:
+    cells = []
+    while packed:
+        index = (packed & MOVE_MASK) - 1
+        cells.append((index % width, index // width))
+        packed >>= MOVE_BITS
+    cells.reverse()
+    return cells
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: float = 16.0):
+        self.size_mb = size_mb
+        self.size = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        self.keys = array("Q", bytes(8 * self.size))
+        self.values = array("q", bytes(8 * self.size))
+        self.moves = array("Q", bytes(8 * self.size))
+        self.depths = array("B", bytes(self.size))
+        self.flags = array("B", bytes(self.size))
+        self.generations = array("B", bytes(self.size))
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+        self.rejections = 0
+
+    def new_search(self):
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        key = key or 1
+        slot = key % self.size
+        stored = self.keys[slot]
+        if stored == key:
+            self.hits += 1
+            return self.depths[slot], self.flags[slot], self.values[slot], self.moves[slot]
+        if stored:
+            self.collisions += 1
+        else:
+            self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: int, move: int = 0):
+        key = key or 1
+        slot = key % self.size
+        stored = self.keys[slot]
+        if not stored:
+            self.used += 1
+        elif stored != key:
+            if self.generations[slot] == self.generation and self.depths[slot] > depth:
+                self.rejections += 1
+                return
+            self.replacements += 1
+        elif self.generations[slot] == self.generation and self.depths[slot] > depth:
+            self.rejections += 1
+            return
+        elif not move:
+            move = self.moves[slot]
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.moves[slot] = move
+        self.depths[slot] = min(depth, 0xFF)
+        self.flags[slot] = flag
+        self.generations[slot] = self.generation
+        self.stores += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        probes = self.hits + self.misses + self.collisions
+        return {
+            "tt_size": self.size,
+            "tt_used": self.used,
+            "tt_fill": self.used / self.size,
+            "tt_hits": self.hits,
+            "tt_misses": self.misses,
+            "tt_collisions": self.collisions,
+            "tt_hit_rate": self.hits / probes if probes else 0.0,
+            "tt_stores": self.stores,
+            "tt_replacements": self.replacements,
+            "tt_rejections": self.rejections,
+        }
@@ -1,7 +1,8 @@
 import argparse
+import multiprocessing
 from pathlib import Path
 import arcade
-from game.board import MIN_BOARD_SIZE, MAX_BOARD_SIZE
+from game.board import MIN_BOARD_SIZE, MAX_BOARD_SIZE, BOARD_BACKENDS, get_max_board_size
 from game.player import MAX_PLAYERS
 from game.settings import get_default_settings
 from game.player_db import init_db
@@ -64,13 +65,16 @@ def main():
     parser.add_argument("--width", type=int, default=20, help=f"Ширина поля ({MIN_BOARD_SIZE}-{MAX_BOARD_SIZE})")
     parser.add_argument("--height", type=int, default=20, help=f"Высота поля ({MIN_BOARD_SIZE}-{MAX_BOARD_SIZE})")
     parser.add_argument("--players", type=int, default=0, choices=range(0, MAX_PLAYERS + 1), help="Количество игроков")
+    parser.add_argument("--board", default="grid", choices=BOARD_BACKENDS, help="Хранение доски")
     args = parser.parse_args()
 
     init_db()
     settings = get_default_settings()
-    settings["width"] = max(MIN_BOARD_SIZE, min(MAX_BOARD_SIZE, args.width))
-    settings["height"] = max(MIN_BOARD_SIZE, min(MAX_BOARD_SIZE, args.height))
+    max_board_size = get_max_board_size(args.board)
+    settings["width"] = max(MIN_BOARD_SIZE, min(max_board_size, args.width))
+    settings["height"] = max(MIN_BOARD_SIZE, min(max_board_size, args.height))
     settings["player_count"] = args.players
+    settings["board_backend"] = args.board
 
     window = GameWindow(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, settings)
     menu_view = MenuView()
@@ -79,4 +83,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -1,19 +1,35 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import arcade
 import arcade.gui
-from game.board import Board
+import pyglet
+from arcade.gl import geometry
+from arcade.texture_atlas import DefaultTextureAtlas
+from game.board import MAX_BOARD_SIZE, create_board
+from game.bots import compute_bot_turn, init_bot_worker
 from game.player import Player
 from game.rules import GameRules
 from game.player_db import record_game_result
 from ui.fade_view import FadeView
 
+HINT_WIN_COLOR = arcade.types.Color(0, 255, 0, 110)
+HINT_NEAR_COLOR = arcade.types.Color(255, 215, 0, 70)
+HINT_THREAT_COLOR = arcade.types.Color(255, 60, 60, 90)
+
 
 class GameView(FadeView):
     RUS_COLS = "АБВГДЕЖИКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+    MIN_CELL_SIZE = 8
+    MIN_OVERFLOW_CELL_SIZE = 16
+    MIN_SCREEN_CELL_SIZE = 8
+    MAX_ZOOM = 3.0
+    ZOOM_STEP = 1.1
     def __init__(self, settings: dict):
         super().__init__()
         self.settings = settings
         self.board = None
         self.players = []
+        self.bots = {}
         self.rules = None
         self.manager = arcade.gui.UIManager()
         self.stats_recorded = False
@@ -35,7 +51,28 @@ class GameView(FadeView):
         
         self.grid_shape_list = None
         self.grid_labels_cache = None
+        self.grid_labels = []
+        self.show_hints = False
+        self.hint_shape_list = None
+        self.hint_key = None
         self.figures_dirty = True
+        self.figure_atlas = None
+        self.figure_atlas_key = None
+        self.figure_textures = {}
+        self.figure_sprites = None
+        self.figure_sprites_key = None
+        self.pending_sprites = None
+        self.board_layer = None
+        self.board_layer_texture = None
+        self.board_layer_quad = None
+        self.board_camera = None
+        self.board_zoom = 1.0
+        self.board_position = (0.0, 0.0)
+        self.board_home = (0.0, 0.0)
+        self.board_view_width = 0
+        self.sidebar_x = 0
+        self.cull_range = None
+        self.board_layer_key = None
         self.awaiting_check = False
         self._sidebar_fade = 0.0
         self._sidebar_fade_phase = None
@@ -43,6 +80,11 @@ class GameView(FadeView):
         self._sidebar_target_awaiting_check = None
         self._board_intro_time = 0.0
         self._board_intro_duration = 0.55
+        self.bot_executor = None
+        self.bot_future = None
+        self.bot_cancelled = None
+        self.bot_token = 0
+        self.bot_thinking_time = 0.0
         
         self.setup_game()
         self.setup_ui()
@@ -58,7 +100,12 @@ class GameView(FadeView):
         self.manager.disable()
 
     def setup_game(self):
-        self.board = Board(self.settings["width"], self.settings["height"])
+        self.board = create_board(
+            self.settings["width"],
+            self.settings["height"],
+            self.settings.get("board_backend", "grid"),
+            self.settings["player_count"]
+        )
         
         self.players = []
         for i in range(self.settings["player_count"]):
@@ -71,6 +118,12 @@ class GameView(FadeView):
             )
             self.players.append(player)
         
+        self.bots = {}
+        for i in range(self.settings["player_count"]):
+            controller = self.settings["players"][i].get("controller", "human")
+            if controller != "human":
+                self.bots[i] = controller
+        
         win_patterns = self.settings.get("win_patterns")
         self.rules = GameRules(self.board, self.players, win_patterns)
         self.stats_recorded = False
@@ -84,12 +137,21 @@ class GameView(FadeView):
         self.stats_recorded = True
     
     def recalculate_layout(self):
-        min_cell_size = 8
+        min_cell_size = self.MIN_CELL_SIZE
+        if max(self.board.width, self.board.height) > MAX_BOARD_SIZE:
+            min_cell_size = self.MIN_OVERFLOW_CELL_SIZE
         side_gap = 30
         outer_margin = 20
 
         self.sidebar_width = max(140, int(self.window.width * 0.22))
 
+        focus = None
+        if self.board_camera is not None:
+            focus = (
+                (self.board_position[0] - self.board_home[0]) / self.cell_size,
+                (self.board_position[1] - self.board_home[1]) / self.cell_size,
+            )
+
         cell_size = max(min_cell_size, int(self.cell_size) or min_cell_size)
         for _ in range(3):
             label_font_size = max(14, int(cell_size * 0.5))
@@ -134,13 +196,122 @@ class GameView(FadeView):
         total_height = bottom_pad + grid_height + top_pad
         extra_y = max(0, self.window.height - total_height)
         self.grid_offset_y = int(bottom_pad + extra_y // 2)
+
+        self.sidebar_x = min(
+            self.grid_offset_x + grid_width + side_gap,
+            self.window.width - self.sidebar_width - right_pad,
+        )
+        self.board_view_width = max(1, self.sidebar_x - 20)
+        self.board_camera = arcade.Camera2D(viewport=arcade.LBWH(0, 0, self.board_view_width, self.window.height))
+        self.board_home = (self.board_view_width / 2, self.window.height / 2)
+        if total_width > self.window.width or total_height > self.window.height:
+            self.board_home = (self.grid_offset_x + grid_width / 2, self.grid_offset_y + grid_height / 2)
+        if focus is None:
+            self.board_zoom = 1.0
+            self.board_position = self.board_home
+        else:
+            self.board_zoom = max(self.get_min_zoom(), min(self.MAX_ZOOM, self.board_zoom))
+            self.board_position = (
+                self.board_home[0] + focus[0] * self.cell_size,
+                self.board_home[1] + focus[1] * self.cell_size,
+            )
+        self.clamp_board_position()
+        self.cull_range = None
+        self.grid_labels_cache = None
+        self.figures_dirty = True
+
+    def get_min_zoom(self) -> float:
+        left, bottom, right, top = self.get_board_bounds()
+        fit = min(1.0, self.board_view_width / (right - left), self.window.height / (top - bottom))
+        return max(fit, self.MIN_SCREEN_CELL_SIZE / self.cell_size)
+
+    def get_board_bounds(self) -> tuple[float, float, float, float]:
+        label_font_size = max(14, int(self.cell_size * 0.5))
+        label_pad = max(14, int(label_font_size * 0.8)) + label_font_size // 2 + 4
+        return (
+            self.grid_offset_x - label_pad,
+            self.grid_offset_y - label_pad,
+            self.grid_offset_x + self.board.width * self.cell_size,
+            self.grid_offset_y + self.board.height * self.cell_size,
+        )
+
+    def clamp_board_position(self):
+        left, bottom, right, top = self.get_board_bounds()
+        half_width = self.board_view_width / 2 / self.board_zoom
+        half_height = self.window.height / 2 / self.board_zoom
+        low_x, high_x = sorted((left + half_width, right - half_width))
+        low_y, high_y = sorted((bottom + half_height, top - half_height))
+        self.board_position = (
+            min(high_x, max(low_x, self.board_position[0])),
+            min(high_y, max(low_y, self.board_position[1])),
+        )
+
+    def screen_to_world(self, x: float, y: float) -> tuple[float, float]:
+        return (
+            (x - self.board_view_width / 2) / self.board_zoom + self.board_position[0],
+            (y - self.window.height / 2) / self.board_zoom + self.board_position[1],
+        )
+
+    def get_visible_range(self, scale: float = 1.0) -> tuple[int, int, int, int]:
+        zoom, (position_x, position_y) = self.get_camera_view(scale)
+        half_width = self.board_view_width / 2 / zoom
+        half_height = self.window.height / 2 / zoom
+        left, right = position_x - half_width, position_x + half_width
+        bottom, top = position_y - half_height, position_y + half_height
+        return (
+            max(0, int((left - self.grid_offset_x) // self.cell_size)),
+            max(0, int((bottom - self.grid_offset_y) // self.cell_size)),
+            min(self.board.width, int((right - self.grid_offset_x) // self.cell_size) + 1),
+            min(self.board.height, int((top - self.grid_offset_y) // self.cell_size) + 1),
+        )
+
+    def update_cull_range(self, scale: float = 1.0):
+        x0, y0, x1, y1 = self.get_visible_range(scale)
+        if self.cull_range is not None:
+            cull_x0, cull_y0, cull_x1, cull_y1 = self.cull_range
+            if cull_x0 <= x0 and cull_y0 <= y0 and x1 <= cull_x1 and y1 <= cull_y1:
+                return
+        margin_x = (x1 - x0) // 2 + 1
+        margin_y = (y1 - y0) // 2 + 1
+        self.cull_range = (
+            max(0, x0 - margin_x),
+            max(0, y0 - margin_y),
+            min(self.board.width, x1 + margin_x),
+            min(self.board.height, y1 + margin_y),
+        )
+        self.grid_shape_list = None
+        self.grid_labels_cache = None
+        self.hint_shape_list = None
+        self.figure_sprites_key = None
+
+    def get_camera_view(self, scale: float = 1.0) -> tuple[float, tuple[float, float]]:
+        zoom = self.board_zoom * scale
+        position_x, position_y = self.board_position
+        if scale < 1.0:
+            center_x = self.grid_offset_x + self.board.width * self.cell_size / 2
+            center_y = self.grid_offset_y + self.board.height * self.cell_size / 2
+            screen_x = (center_x - position_x) * self.board_zoom + self.board_view_width / 2
+            screen_y = (center_y - position_y) * self.board_zoom + self.window.height / 2
+            shift = (1.0 - scale) / zoom
+            position_x -= (min(self.board_view_width, max(0, screen_x)) - self.board_view_width / 2) * shift
+            position_y -= (min(self.window.height, max(0, screen_y)) - self.window.height / 2) * shift
+        return zoom, (position_x, position_y)
+
+    def apply_board_camera(self, scale: float = 1.0, pixel_ratio: float = 1.0) -> arcade.Camera2D:
+        zoom, position = self.get_camera_view(scale)
+        self.board_camera.viewport = arcade.LBWH(
+            0, 0, self.board_view_width * pixel_ratio, self.window.height * pixel_ratio
+        )
+        self.board_camera.zoom = zoom
+        self.board_camera.position = position
+        return self.board_camera
     
     def setup_ui(self):
         self.manager.clear()
         scale = min(self.window.width / 1024, self.window.height / 768)
         scale = max(0.75, min(1.2, scale))
         
-        sidebar_x = self.grid_offset_x + self.board.width * self.cell_size + 30
+        sidebar_x = self.sidebar_x
         
         v_box = arcade.gui.UIBoxLayout()
         
@@ -215,15 +386,20 @@ class GameView(FadeView):
         super().on_resize(width, height)
         self.recalculate_layout()
         self.grid_shape_list = None
+        self.hint_shape_list = None
         self.setup_ui()
     
     def on_hide_view(self):
         self.manager.disable()
+        self.cancel_bot_turn()
+        self.reset_bot_executor()
     
     def on_update(self, delta_time):
         super().on_update(delta_time)
         if self._board_intro_time < self._board_intro_duration:
             self._board_intro_time = min(self._board_intro_duration, self._board_intro_time + float(delta_time))
+            if self._board_intro_time >= self._board_intro_duration:
+                self.cull_range = None
         if self._sidebar_fade_phase == "out":
             self._sidebar_fade = min(1.0, self._sidebar_fade + float(delta_time) / self._sidebar_fade_duration)
             if self._sidebar_fade >= 1.0:
@@ -249,22 +425,153 @@ class GameView(FadeView):
             seconds = int(self.game_time) % 60
             if self.timer_label:
                 self.timer_label.text = f"Время: {minutes}:{seconds:02d}"
+
+        self.update_bot_turn(delta_time)
+
+    def is_bot_turn(self) -> bool:
+        return not self.rules.game_over and self.rules.current_player_index in self.bots
+
+    def update_bot_turn(self, delta_time: float):
+        if self.bot_future is not None:
+            if not self.bot_future.done():
+                self.bot_thinking_time += delta_time
+                self.update_thinking_label()
+                return
+            try:
+                moves, stats = self.bot_future.result()
+            except Exception:
+                self.bot_future = None
+                self.reset_bot_executor()
+                self.rules.clear_pending_moves()
+                self.rules.advance_turn()
+                self.show_message("ИИ: ошибка при расчёте хода, ход пропущен")
+                self.update_labels()
+                return
+            self.bot_future = None
+            self.play_bot_turn(moves, stats)
+            return
+        if not self.is_bot_turn() or self.awaiting_check:
+            return
+        if self._sidebar_fade_phase is not None or self._board_intro_time < self._board_intro_duration:
+            return
+        self.start_bot_turn()
+
+    def start_bot_turn(self):
+        if self.bot_executor is None:
+            self.bot_cancelled = multiprocessing.Value("q", 0)
+            self.bot_executor = ProcessPoolExecutor(max_workers=1, initializer=init_bot_worker, initargs=(self.bot_cancelled,))
+        index = self.rules.current_player_index
+        options = {"time_budget": self.settings.get("bot_time_budget", 1.0)}
+        self.bot_token += 1
+        self.bot_thinking_time = 0.0
+        self.bot_future = self.bot_executor.submit(
+            compute_bot_turn, index, self.bots[index], options, self.rules, self.bot_token
+        )
+        self.update_thinking_label()
+
+    def cancel_bot_turn(self):
+        if self.bot_future is not None:
+            self.bot_cancelled.value = self.bot_token
+            self.bot_future.cancel()
+        self.bot_future = None
+
+    def reset_bot_executor(self):
+        if self.bot_executor is not None:
+            self.bot_executor.shutdown(wait=False, cancel_futures=True)
+            self.bot_executor = None
+
+    def update_thinking_label(self):
+        text = "ИИ думает" + "." * (int(self.bot_thinking_time * 3) % 4)
+        if self.remaining_moves_label and self.remaining_moves_label.text != text:
+            self.remaining_moves_label.text = text
+
+    def play_bot_turn(self, moves, stats):
+        self.rules.clear_pending_moves()
+        for x, y in moves:
+            self.rules.add_pending_move(x, y)
+        self.rules.confirm_turn()
+        if stats and stats.get("book"):
+            self.show_message("ИИ: ход из дебютной книги")
+        elif stats and "playouts_per_second" in stats:
+            self.show_message(
+                f"ИИ: {stats['playouts']} партий, {int(stats['playouts_per_second'])} партий/с"
+            )
+        elif stats:
+            text = f"ИИ: глубина {stats['depth']}, {int(stats['nodes_per_second'])} узлов/с"
+            if "tt_hit_rate" in stats:
+                text += f", кэш {stats['tt_hit_rate']:.0%}"
+            self.show_message(text)
+        if self.rules.game_over:
+            self.finish_game()
+            return
+        success, _ = self.rules.check_winner()
+        if success:
+            self.finish_game()
+            return
+        self.rules.advance_turn()
+        self.update_labels()
     
     def on_draw(self):
         self.clear()
-        self.draw_grid()
-        self.draw_figures()
-        self.draw_pending_moves()
-        self.draw_winning_line()
+        scale = self.get_board_intro_scale()
+        if scale < 1.0:
+            self.draw_board_intro(scale)
+        else:
+            self.draw_board_layer()
         self.manager.draw()
         self.draw_message()
         self.draw_sidebar_fade()
         self.draw_fade()
 
+    def draw_board(self):
+        self.draw_grid()
+        self.draw_hints()
+        self.draw_figures()
+        self.draw_pending_moves()
+        self.draw_winning_line()
+
+    def draw_board_intro(self, scale: float):
+        self.update_cull_range(scale)
+        with self.apply_board_camera(scale).activate():
+            self.draw_board()
+
+    def build_board_layer(self):
+        ctx = self.window.ctx
+        size = self.window.get_framebuffer_size()
+        self.board_layer_texture = ctx.texture(size, components=4, filter=(ctx.NEAREST, ctx.NEAREST))
+        self.board_layer = ctx.framebuffer(color_attachments=[self.board_layer_texture])
+        if self.board_layer_quad is None:
+            self.board_layer_quad = geometry.quad_2d_fs()
+
+    def draw_board_layer(self):
+        key = (
+            self.board.zobrist_hash,
+            self.rules.current_player_index,
+            tuple(self.rules.pending_moves),
+            tuple(self.rules.winning_cells or ()),
+            self.hints_visible(),
+            self.board_zoom,
+            self.board_position,
+        )
+        if self.figures_dirty or key != self.board_layer_key:
+            if self.board_layer is None or self.board_layer.size != self.window.get_framebuffer_size():
+                self.build_board_layer()
+            self.update_cull_range()
+            with self.board_layer.activate() as fbo:
+                fbo.clear(color=self.window.background_color)
+                with self.apply_board_camera(pixel_ratio=self.window.get_pixel_ratio()).activate():
+                    self.draw_board()
+            self.board_layer_key = key
+            self.figures_dirty = False
+        ctx = self.window.ctx
+        with ctx.enabled_only():
+            self.board_layer_texture.use(0)
+            self.board_layer_quad.render(ctx.utility_textured_quad_program)
+
     def draw_sidebar_fade(self):
         if self._sidebar_fade <= 0.0 or not self.window:
             return
-        left = self.grid_offset_x + self.board.width * self.cell_size + 10
+        left = self.board_view_width
         width = max(0, self.window.width - left)
         if width <= 0:
             return
@@ -284,39 +591,34 @@ class GameView(FadeView):
     
     def build_grid_cache(self):
         self.grid_shape_list = arcade.shape_list.ShapeElementList()
+        x0, y0, x1, y1 = self.cull_range
         
-        for y in range(self.board.height + 1):
-            start_x = self.grid_offset_x
-            end_x = self.grid_offset_x + self.board.width * self.cell_size
+        for y in range(y0, y1 + 1):
+            start_x = self.grid_offset_x + x0 * self.cell_size
+            end_x = self.grid_offset_x + x1 * self.cell_size
             pos_y = self.grid_offset_y + y * self.cell_size
             line = arcade.shape_list.create_line(start_x, pos_y, end_x, pos_y, arcade.color.WHITE, 1)
             self.grid_shape_list.append(line)
         
-        for x in range(self.board.width + 1):
+        for x in range(x0, x1 + 1):
             pos_x = self.grid_offset_x + x * self.cell_size
-            start_y = self.grid_offset_y
-            end_y = self.grid_offset_y + self.board.height * self.cell_size
+            start_y = self.grid_offset_y + y0 * self.cell_size
+            end_y = self.grid_offset_y + y1 * self.cell_size
             line = arcade.shape_list.create_line(pos_x, start_y, pos_x, end_y, arcade.color.WHITE, 1)
             self.grid_shape_list.append(line)
     
-    def draw_grid(self):
-        scale = self.get_board_intro_scale()
-        if scale < 0.999:
-            self.draw_grid_scaled(scale)
-            return
-        if self.grid_shape_list is None:
-            self.build_grid_cache()
-        
-        self.grid_shape_list.draw()
-
+    def build_grid_labels(self):
+        self.grid_labels_cache = pyglet.graphics.Batch()
+        self.grid_labels = []
         label_font_size = max(14, int(self.cell_size * 0.5))
         label_offset = max(14, int(label_font_size * 0.8))
-        
-        for x in range(self.board.width):
+        x0, y0, x1, y1 = self.cull_range
+
+        for x in range(x0, x1):
             col_label = self.RUS_COLS[x] if x < len(self.RUS_COLS) else f"{x+1}"
             pos_x = self.grid_offset_x + x * self.cell_size + self.cell_size // 2
             pos_y = self.grid_offset_y - label_offset
-            arcade.draw_text(
+            self.grid_labels.append(arcade.Text(
                 col_label,
                 pos_x,
                 pos_y,
@@ -324,13 +626,14 @@ class GameView(FadeView):
                 label_font_size,
                 anchor_x="center",
                 anchor_y="center",
-            )
+                batch=self.grid_labels_cache,
+            ))
 
-        for y in range(self.board.height):
+        for y in range(y0, y1):
             row_label = str(y + 1)
             pos_x = self.grid_offset_x - label_offset
             pos_y = self.grid_offset_y + y * self.cell_size + self.cell_size // 2
-            arcade.draw_text(
+            self.grid_labels.append(arcade.Text(
                 row_label,
                 pos_x,
                 pos_y,
@@ -338,7 +641,58 @@ class GameView(FadeView):
                 label_font_size,
                 anchor_x="center",
                 anchor_y="center",
-            )
+                batch=self.grid_labels_cache,
+            ))
+
+    def build_hint_cache(self):
+        self.hint_shape_list = arcade.shape_list.ShapeElementList()
+        winning, near, threats = self.rules.get_hint_cells()
+        x0, y0, x1, y1 = self.cull_range
+        points = []
+        colors = []
+        for cells, color in ((threats, HINT_THREAT_COLOR), (near, HINT_NEAR_COLOR), (winning, HINT_WIN_COLOR)):
+            for x, y in cells:
+                if not (x0 <= x < x1 and y0 <= y < y1):
+                    continue
+                left = self.grid_offset_x + x * self.cell_size + 2
+                bottom = self.grid_offset_y + y * self.cell_size + 2
+                right = left + self.cell_size - 4
+                top = bottom + self.cell_size - 4
+                points += [(left, top), (right, top), (right, bottom), (left, bottom)]
+                colors += [color] * 4
+        if points:
+            self.hint_shape_list.append(arcade.shape_list.create_rectangles_filled_with_colors(points, colors))
+
+    def hints_visible(self) -> bool:
+        return self.show_hints and not (self.rules.game_over or self.awaiting_check or self.is_bot_turn())
+
+    def draw_hints(self):
+        if not self.hints_visible():
+            return
+        if self.get_board_intro_scale() < 1.0:
+            return
+        key = (
+            self.board.zobrist_hash,
+            self.rules.current_player_index,
+            tuple(self.rules.pending_moves),
+        )
+        if self.hint_shape_list is None or key != self.hint_key:
+            self.build_hint_cache()
+            self.hint_key = key
+        self.hint_shape_list.draw()
+
+    def toggle_hints(self):
+        self.show_hints = not self.show_hints
+        self.show_message("Подсказки включены" if self.show_hints else "Подсказки выключены")
+
+    def draw_grid(self):
+        if self.grid_shape_list is None:
+            self.build_grid_cache()
+        if self.grid_labels_cache is None:
+            self.build_grid_labels()
+        
+        self.grid_shape_list.draw()
+        self.grid_labels_cache.draw()
 
     def get_board_intro_scale(self) -> float:
         if self._board_intro_duration <= 0:
@@ -347,69 +701,6 @@ class GameView(FadeView):
         ease = 1.0 - (1.0 - progress) ** 3
         return 0.2 + 0.8 * ease
 
-    def transform_point(self, x: float, y: float, scale: float) -> tuple[float, float]:
-        center_x = self.grid_offset_x + self.board.width * self.cell_size / 2
-        center_y = self.grid_offset_y + self.board.height * self.cell_size / 2
-        return (
-            center_x + (x - center_x) * scale,
-            center_y + (y - center_y) * scale,
-        )
-
-    def draw_grid_scaled(self, scale: float):
-        center_x = self.grid_offset_x + self.board.width * self.cell_size / 2
-        center_y = self.grid_offset_y + self.board.height * self.cell_size / 2
-        grid_left = self.grid_offset_x
-        grid_bottom = self.grid_offset_y
-        grid_right = grid_left + self.board.width * self.cell_size
-        grid_top = grid_bottom + self.board.height * self.cell_size
-        thickness = max(1, int(1 * scale))
-
-        for y in range(self.board.height + 1):
-            pos_y = grid_bottom + y * self.cell_size
-            start_x, start_y = self.transform_point(grid_left, pos_y, scale)
-            end_x, end_y = self.transform_point(grid_right, pos_y, scale)
-            arcade.draw_line(start_x, start_y, end_x, end_y, arcade.color.WHITE, thickness)
-
-        for x in range(self.board.width + 1):
-            pos_x = grid_left + x * self.cell_size
-            start_x, start_y = self.transform_point(pos_x, grid_bottom, scale)
-            end_x, end_y = self.transform_point(pos_x, grid_top, scale)
-            arcade.draw_line(start_x, start_y, end_x, end_y, arcade.color.WHITE, thickness)
-
-        base_label_font_size = max(14, int(self.cell_size * 0.5))
-        label_font_size = max(8, int(base_label_font_size * scale))
-        label_offset = max(10, int(max(14, int(base_label_font_size * 0.8)) * scale))
-
-        for x in range(self.board.width):
-            col_label = self.RUS_COLS[x] if x < len(self.RUS_COLS) else f"{x + 1}"
-            pos_x = grid_left + x * self.cell_size + self.cell_size / 2
-            pos_y = grid_bottom - label_offset
-            draw_x, draw_y = self.transform_point(pos_x, pos_y, scale)
-            arcade.draw_text(
-                col_label,
-                draw_x,
-                draw_y,
-                arcade.color.WHITE,
-                label_font_size,
-                anchor_x="center",
-                anchor_y="center",
-            )
-
-        for y in range(self.board.height):
-            row_label = str(y + 1)
-            pos_x = grid_left - label_offset
-            pos_y = grid_bottom + y * self.cell_size + self.cell_size / 2
-            draw_x, draw_y = self.transform_point(pos_x, pos_y, scale)
-            arcade.draw_text(
-                row_label,
-                draw_x,
-                draw_y,
-                arcade.color.WHITE,
-                label_font_size,
-                anchor_x="center",
-                anchor_y="center",
-            )
-    
     def draw_figure_with_outline(self, text, center_x, center_y, color, font_size, alpha=255):
         outline_offset = max(1, font_size // 12)
         outline_color = (255, 255, 255, alpha)
@@ -459,61 +750,83 @@ class GameView(FadeView):
             bold=True
         )
     
-    def draw_figures(self):
-        scale = self.get_board_intro_scale()
-        for y in range(self.board.height):
-            for x in range(self.board.width):
+    def build_figure_atlas(self):
+        font_size = max(8, int(self.cell_size * 0.6))
+        key = (font_size, tuple((player.player_id, player.figure, tuple(player.color[:3])) for player in self.players))
+        if key == self.figure_atlas_key:
+            return
+        size = font_size * 2
+        self.figure_atlas = DefaultTextureAtlas((256, 256))
+        self.figure_textures = {}
+        for player in self.players:
+            texture = arcade.Texture.create_empty(f"figure:{player.player_id}:{font_size}", (size, size))
+            self.figure_atlas.add(texture)
+            with self.figure_atlas.render_into(texture) as fbo:
+                fbo.clear()
+                self.draw_figure_with_outline(player.figure, size / 2, size / 2, player.color, font_size)
+            self.figure_textures[player.player_id] = texture
+        self.figure_sprites = arcade.SpriteList(atlas=self.figure_atlas)
+        self.pending_sprites = arcade.SpriteList(atlas=self.figure_atlas)
+        self.figure_atlas_key = key
+        self.figure_sprites_key = None
+
+    def iter_visible_stones(self):
+        x0, y0, x1, y1 = self.cull_range
+        if self.board.stone_count <= (x1 - x0) * (y1 - y0):
+            for x, y, player_id in self.board.iter_stones():
+                if x0 <= x < x1 and y0 <= y < y1:
+                    yield x, y, player_id
+            return
+        for y in range(y0, y1):
+            for x in range(x0, x1):
                 player_id = self.board.get_cell(x, y)
                 if player_id is not None:
-                    player = self.players[player_id]
-                    base_x = self.grid_offset_x + x * self.cell_size + self.cell_size / 2
-                    base_y = self.grid_offset_y + y * self.cell_size + self.cell_size / 2
-                    center_x, center_y = self.transform_point(base_x, base_y, scale)
-                    font_size = max(8, int(self.cell_size * 0.6 * scale))
-                    self.draw_figure_with_outline(
-                        player.figure,
-                        center_x, center_y,
-                        player.color,
-                        font_size
-                    )
+                    yield x, y, player_id
+
+    def draw_figures(self):
+        self.build_figure_atlas()
+        key = (self.board.zobrist_hash, self.board.stone_count, self.grid_offset_x, self.grid_offset_y, self.cull_range)
+        if key != self.figure_sprites_key:
+            self.figure_sprites.clear()
+            for x, y, player_id in self.iter_visible_stones():
+                center_x = self.grid_offset_x + x * self.cell_size + self.cell_size / 2
+                center_y = self.grid_offset_y + y * self.cell_size + self.cell_size / 2
+                self.figure_sprites.append(
+                    arcade.Sprite(self.figure_textures[player_id], center_x=center_x, center_y=center_y)
+                )
+            self.figure_sprites_key = key
+        self.figure_sprites.draw()
     
     def draw_pending_moves(self):
-        scale = self.get_board_intro_scale()
         current = self.rules.get_current_player()
+        self.pending_sprites.clear()
         for x, y in self.rules.pending_moves:
-            base_x = self.grid_offset_x + x * self.cell_size + self.cell_size / 2
-            base_y = self.grid_offset_y + y * self.cell_size + self.cell_size / 2
-            center_x, center_y = self.transform_point(base_x, base_y, scale)
+            center_x = self.grid_offset_x + x * self.cell_size + self.cell_size / 2
+            center_y = self.grid_offset_y + y * self.cell_size + self.cell_size / 2
             
             rect = arcade.Rect.from_kwargs(
                 x=center_x,
                 y=center_y,
-                width=(self.cell_size - 4) * scale,
-                height=(self.cell_size - 4) * scale
+                width=self.cell_size - 4,
+                height=self.cell_size - 4
             )
             arcade.draw_rect_outline(rect, arcade.color.YELLOW, 2)
             
-            font_size = max(8, int(self.cell_size * 0.5 * scale))
-            self.draw_figure_with_outline(
-                current.figure,
-                center_x, center_y,
-                current.color,
-                font_size,
-                alpha=128
-            )
+            sprite = arcade.Sprite(self.figure_textures[current.player_id], scale=5 / 6, center_x=center_x, center_y=center_y)
+            sprite.alpha = 128
+            self.pending_sprites.append(sprite)
+        self.pending_sprites.draw()
     
     def draw_winning_line(self):
-        scale = self.get_board_intro_scale()
         if self.rules.winning_cells:
             for x, y in self.rules.winning_cells:
-                base_x = self.grid_offset_x + x * self.cell_size + self.cell_size / 2
-                base_y = self.grid_offset_y + y * self.cell_size + self.cell_size / 2
-                center_x, center_y = self.transform_point(base_x, base_y, scale)
+                center_x = self.grid_offset_x + x * self.cell_size + self.cell_size / 2
+                center_y = self.grid_offset_y + y * self.cell_size + self.cell_size / 2
                 rect = arcade.Rect.from_kwargs(
                     x=center_x,
                     y=center_y,
-                    width=(self.cell_size - 2) * scale,
-                    height=(self.cell_size - 2) * scale
+                    width=self.cell_size - 2,
+                    height=self.cell_size - 2
                 )
                 arcade.draw_rect_filled(rect, (0, 255, 0, 100))
                 arcade.draw_rect_outline(rect, (0, 255, 0, 255), 3)
@@ -534,15 +847,20 @@ class GameView(FadeView):
         self.message_timer = duration
     
     def get_cell_from_mouse(self, x: int, y: int):
-        cell_x = (x - self.grid_offset_x) // self.cell_size
-        cell_y = (y - self.grid_offset_y) // self.cell_size
+        if x >= self.board_view_width:
+            return None
+        world_x, world_y = self.screen_to_world(x, y)
+        cell_x = (world_x - self.grid_offset_x) // self.cell_size
+        cell_y = (world_y - self.grid_offset_y) // self.cell_size
         
         if 0 <= cell_x < self.board.width and 0 <= cell_y < self.board.height:
             return int(cell_x), int(cell_y)
         return None
     
     def on_mouse_press(self, x, y, button, modifiers):
-        if self.rules.game_over or self.awaiting_check:
+        if button != arcade.MOUSE_BUTTON_LEFT:
+            return
+        if self.rules.game_over or self.awaiting_check or self.is_bot_turn():
             return
         if self._sidebar_fade_phase is not None:
             return
@@ -555,6 +873,26 @@ class GameView(FadeView):
                 self.show_message(msg)
             self.update_labels()
     
+    def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
+        if not buttons & (arcade.MOUSE_BUTTON_RIGHT | arcade.MOUSE_BUTTON_MIDDLE):
+            return
+        position_x, position_y = self.board_position
+        self.board_position = (position_x - dx / self.board_zoom, position_y - dy / self.board_zoom)
+        self.clamp_board_position()
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        if x >= self.board_view_width:
+            return
+        zoom = self.board_zoom * self.ZOOM_STEP ** scroll_y
+        zoom = max(self.get_min_zoom(), min(self.MAX_ZOOM, zoom))
+        world_x, world_y = self.screen_to_world(x, y)
+        self.board_zoom = zoom
+        self.board_position = (
+            world_x - (x - self.board_view_width / 2) / zoom,
+            world_y - (y - self.window.height / 2) / zoom,
+        )
+        self.clamp_board_position()
+
     def on_key_press(self, key, modifiers):
         if self.awaiting_check:
             if key == arcade.key.ESCAPE:
@@ -564,16 +902,22 @@ class GameView(FadeView):
             return
         if key == arcade.key.ENTER:
             self.on_confirm_click(None)
+        elif key == arcade.key.H:
+            self.toggle_hints()
         elif key == arcade.key.ESCAPE:
             self.on_menu_click(None)
 
     def on_confirm_click(self, event):
-        if self.rules.game_over or self.awaiting_check:
+        if self.rules.game_over or self.awaiting_check or self.is_bot_turn():
             return
         if self._sidebar_fade_phase is not None:
             return
 
         success, msg = self.rules.confirm_turn()
+        if success and self.rules.game_over:
+            self.show_message("Ничья: никто не может собрать фигуру")
+            self.finish_game()
+            return
         if success:
             self.start_sidebar_transition(True)
             return
@@ -588,27 +932,24 @@ class GameView(FadeView):
 
         success, _ = self.rules.check_winner()
         if success:
-            self.record_stats_once()
-            if self.settings.get("hide_board_on_win", True):
-                from ui.result_view import ResultView
-                result_view = ResultView(self.rules.winner, self.rules.is_draw, self.settings)
-                self.window.show_view_fade(result_view)
-            else:
-                self.show_game_over_ui()
+            self.finish_game()
             return
         self.rules.eliminate_last_player()
         if self.rules.is_draw or self.rules.game_over:
-            self.record_stats_once()
-            if self.settings.get("hide_board_on_win", True):
-                from ui.result_view import ResultView
-                result_view = ResultView(self.rules.winner, self.rules.is_draw, self.settings)
-                self.window.show_view_fade(result_view)
-            else:
-                self.show_game_over_ui()
+            self.finish_game()
             return
         self.rules.advance_turn()
         self.start_sidebar_transition(False)
 
+    def finish_game(self):
+        self.record_stats_once()
+        if self.settings.get("hide_board_on_win", True):
+            from ui.result_view import ResultView
+            result_view = ResultView(self.rules.winner, self.rules.is_draw, self.settings)
+            self.window.show_view_fade(result_view)
+        else:
+            self.show_game_over_ui()
+
     def on_next_click(self, event):
         if self.rules.game_over:
             return
@@ -650,7 +991,7 @@ class GameView(FadeView):
         menu_btn.on_click = self.on_menu_click
         v_box.add(menu_btn)
         
-        sidebar_x = self.grid_offset_x + self.board.width * self.cell_size + 30
+        sidebar_x = self.sidebar_x
         
         anchor = arcade.gui.UIAnchorLayout()
         anchor.add(
@@ -664,15 +1005,18 @@ class GameView(FadeView):
     
     def on_new_game_click(self, event):
         from ui.game_view import GameView
+        self.cancel_bot_turn()
         game_view = GameView(self.settings)
         self.window.show_view_fade(game_view)
     
     def on_undo_click(self, event):
+        if self.is_bot_turn():
+            return
         self.rules.remove_last_pending_move()
         self.update_labels()
     
     def on_skip_click(self, event):
-        if self.rules.game_over:
+        if self.rules.game_over or self.is_bot_turn():
             return
         
         success, msg = self.rules.skip_turn()
@@ -681,5 +1025,6 @@ class GameView(FadeView):
     
     def on_menu_click(self, event):
         from ui.menu_view import MenuView
+        self.cancel_bot_turn()
         menu_view = MenuView()
         self.window.show_view_fade(menu_view)
@@ -73,7 +73,7 @@ class MenuView(FadeView):
         v_box.add(self.error_label.with_padding(top=int(10 * scale)))
 
         hint_label = arcade.gui.UILabel(
-            text="Клик мышью - выбор клетки | Enter - подтвердить ход",
+            text="Клик мышью - выбор клетки | Enter - подтвердить ход | H - подсказки",
             font_size=int(18 * scale),
             font_name="Arial",
             text_color=(200, 200, 200)
@@ -31,6 +31,7 @@ class RulesView(FadeView):
             "• За один ход можно поставить до 3 фигур",
             "• Нельзя ставить фигуру в занятую клетку",
             "• Клик мышью для выбора клетки",
+            "• Правая кнопка мыши сдвигает поле, колесо меняет масштаб",
             "• Нажмите 'Подтвердить' для завершения хода",
             "• Если игрок считает, что он победил, то необходимо нажать кнопку 'проверить'",
             "• Игра заканчивается победой или ничьей",
@@ -1,7 +1,7 @@
 import arcade
 import arcade.gui
 from game.board import MIN_BOARD_SIZE, MAX_BOARD_SIZE
-from game.player import AVAILABLE_FIGURES, AVAILABLE_COLORS, COLOR_NAMES, MAX_PLAYERS
+from game.player import AVAILABLE_FIGURES, AVAILABLE_COLORS, AVAILABLE_CONTROLLERS, COLOR_NAMES, CONTROLLER_NAMES, MAX_PLAYERS
 from game.settings import get_default_settings
 from game.player_db import get_player_names
 from ui.fade_view import FadeView
@@ -60,6 +60,7 @@ class SettingsView(FadeView):
         name_width = max(110, int(150 * scale))
         figure_width = max(44, int(50 * scale))
         color_width = max(95, int(110 * scale))
+        controller_width = max(80, int(95 * scale))
         if player_columns == 2:
             name_width = max(100, int(130 * scale))
             color_width = max(90, int(100 * scale))
@@ -261,13 +262,24 @@ class SettingsView(FadeView):
             )
             color_btn.player_index = i
             color_btn.on_click = self.on_open_color_dropdown
-            player_box.add(color_btn)
+            player_box.add(color_btn.with_padding(right=10))
+            
+            controller = settings["players"][i].get("controller", "human")
+            controller_btn = arcade.gui.UIFlatButton(
+                text=CONTROLLER_NAMES.get(controller, "?"),
+                width=controller_width,
+                height=btn_height
+            )
+            controller_btn.player_index = i
+            controller_btn.on_click = self.on_toggle_controller
+            player_box.add(controller_btn)
             
             self.player_settings.append({
                 "box": player_box,
                 "name_btn": name_btn,
                 "figure_btn": figure_btn,
-                "color_btn": color_btn
+                "color_btn": color_btn,
+                "controller_btn": controller_btn
             })
             column_index = min(i // players_per_col, player_columns - 1)
             column_boxes[column_index].add(player_box.with_padding(bottom=row_spacing))
@@ -526,7 +538,8 @@ class SettingsView(FadeView):
             players.append({
                 "name": "",
                 "figure": AVAILABLE_FIGURES[i],
-                "color": AVAILABLE_COLORS[i]
+                "color": AVAILABLE_COLORS[i],
+                "controller": "human"
             })
         for i in range(MAX_PLAYERS):
             if players[i].get("name") is None:
@@ -535,6 +548,8 @@ class SettingsView(FadeView):
                 players[i]["figure"] = AVAILABLE_FIGURES[i % len(AVAILABLE_FIGURES)]
             if players[i].get("color") not in AVAILABLE_COLORS:
                 players[i]["color"] = AVAILABLE_COLORS[i % len(AVAILABLE_COLORS)]
+            if players[i].get("controller") not in AVAILABLE_CONTROLLERS:
+                players[i]["controller"] = "human"
         settings["players"] = players
         self.ensure_unique_settings(update_ui=False)
     
@@ -666,6 +681,14 @@ class SettingsView(FadeView):
         self.dropdown_items = list(AVAILABLE_COLORS)
         self.dropdown_anchor = (btn.rect.center_x, btn.rect.bottom - 6)
     
+    def on_toggle_controller(self, event):
+        idx = event.source.player_index
+        player = self.window.game_settings["players"][idx]
+        current = player.get("controller", "human")
+        position = AVAILABLE_CONTROLLERS.index(current) if current in AVAILABLE_CONTROLLERS else -1
+        player["controller"] = AVAILABLE_CONTROLLERS[(position + 1) % len(AVAILABLE_CONTROLLERS)]
+        self.player_settings[idx]["controller_btn"].text = CONTROLLER_NAMES.get(player["controller"], "?")
+    
     def on_decrease_width(self, event):
         settings = self.window.game_settings
         if settings["width"] > MIN_BOARD_SIZE: